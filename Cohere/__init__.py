@@ -2,7 +2,7 @@
 Cohere API Package
 """
 
-from .cohere_service import CohereAPI
+from .cohere_service import CohereAPI, ParsedQuery, safe_int
 
-__all__ = ['CohereAPI']
+__all__ = ['CohereAPI', 'ParsedQuery', 'safe_int']
 
@@ -3,14 +3,119 @@ Cohere API Service
 Abstraction layer for Cohere AI natural language processing.
 """
 
+import logging
+import math
 import os
+import re
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
 import cohere
-from typing import Dict, Optional
+import httpx
+import orjson
+from typing import Dict, Final, Optional
+
+# Try to import redis for the persistent, cross-worker parse cache
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
 
 # Suppress Pydantic V1 compatibility warning from cohere library
 warnings.filterwarnings("ignore", message=".*Pydantic V1.*")
 
+logger = logging.getLogger(__name__)
+
+# Instructions sent as the system message of every parse call (built once at import)
+_PARSE_INSTRUCTIONS: Final[str] = (
+    "Extract car search filters from the user's message as JSON matching the schema. Rules: "
+    "color is a basic color (red, blue, black, white, silver...) or null; "
+    "make (pick one), model and carType are null if unspecified; "
+    "carType is one of Convertible, Coupe, Hatchback, Hybrid, Sedan, SUV, Minivan, Pickup Truck; "
+    "turn vague amounts into integers (low mileage -> 5000); "
+    "maximumPrice, maximumMileage, minYear default to 0, maxYear to 2026 (the current year); "
+    "if the message is not about cars set not_car_related to true."
+)
+
+# Shared by every request, so only the user message differs between calls
+_SYSTEM_MESSAGE: Final[dict] = {"role": "system", "content": _PARSE_INSTRUCTIONS}
+
+# JSON schema Cohere must follow, so the reply can be decoded directly
+_RESPONSE_FORMAT: Final[dict] = {
+    "type": "json_object",
+    "json_schema": {
+        "type": "object",
+        "properties": {
+            "maximumPrice": {"type": "integer"},
+            "maximumMileage": {"type": "integer"},
+            "minYear": {"type": "integer"},
+            "maxYear": {"type": "integer"},
+            "color": {"type": ["string", "null"]},
+            "make": {"type": ["string", "null"]},
+            "model": {"type": ["string", "null"]},
+            "carType": {"type": ["string", "null"]},
+            "not_car_related": {"type": "boolean"},
+        },
+        "required": ["maximumPrice", "maximumMileage", "minYear", "maxYear"],
+    },
+}
+
+# Leading number in a value such as "20,000", "$15000.00" or "1e5"
+_NUMBER_RE = re.compile(r"-?\d[\d,]*(?:\.\d*)?(?:[eE][-+]?\d+)?")
+
+
+def safe_int(value, default=0) -> int:
+    """
+    Safely convert value to integer (commas ignored, fractional part dropped).
+    Shared with BackendService, which parses API filter values the same way.
+    """
+    # Fast path: numbers (the common case) skip the str() + regex scan
+    if type(value) is int:  # not bool, which the regex path maps to default
+        return value
+    if isinstance(value, float):
+        return int(value) if math.isfinite(value) else default
+    match = _NUMBER_RE.search(str(value))
+    if match is None:
+        return default
+    number = match.group().replace(",", "")
+    try:
+        return int(number)
+    except ValueError:
+        pass
+    # Decimal or exponent form ("15000.00", "1e5")
+    try:
+        return int(float(number))
+    except OverflowError:
+        return default
+
+
+def _optional_text(value) -> Optional[str]:
+    """Return stripped text, or None for missing/'null' values."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    return None if not text or text.lower() == "null" else text
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedQuery:
+    """
+    Structured car search parameters extracted from a natural language prompt.
+    Immutable, so cached instances can be shared between requests without copying.
+    """
+    maximum_price: int = 0
+    maximum_mileage: int = 0
+    min_year: int = 0
+    max_year: int = 2026
+    color: Optional[str] = None
+    make: Optional[str] = None
+    model: Optional[str] = None
+    car_type: Optional[str] = None
+    error: Optional[str] = None  # Set when the prompt does not relate to cars
+
 
 class CohereAPI:
     """
@@ -18,12 +123,34 @@ class CohereAPI:
     Provides methods for parsing natural language car search queries.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Query parsing is short structured extraction, so the small, fast model tier is enough
+    PARSE_MODEL = "command-r7b-12-2024"
+    # The JSON reply is ~60 tokens; the cap stops a runaway generation early
+    PARSE_MAX_TOKENS = 128
+    
+    # Maximum number of in-flight chat calls across request threads (Cohere rate limit)
+    MAX_CONCURRENT_CALLS = 8
+    
+    # Parsed-query cache: identical prompts skip the Cohere round-trip
+    CACHE_MAX_ENTRIES = 1024
+    CACHE_TTL_SECONDS = 3600
+    
+    # Shared Redis tier (REDIS_URL), so every gunicorn worker benefits from a parse
+    REDIS_KEY_PREFIX = "parse:v2:"
+    REDIS_TTL_SECONDS = 7 * 24 * 3600
+    
+    # Chat calls slower than this are logged as a warning
+    SLOW_CHAT_SECONDS = 1.0
+    
+    def __init__(self, api_key: Optional[str] = None, redis_url: Optional[str] = None, chat_latency=None):
         """
         Initialize Cohere API client.
         
         Args:
             api_key: Cohere API key. If None, will try to get from environment.
+            redis_url: Redis URL for the shared parse cache. If None, uses REDIS_URL (optional).
+            chat_latency: Optional histogram (anything with observe(seconds)) that records
+                the duration of each parse chat call; cache hits never reach it.
         
         Raises:
             ValueError: If API key is not provided or found in environment.
@@ -37,10 +164,32 @@ class CohereAPI:
                 "Please provide API key or set COHERE_API_KEY environment variable."
             )
         
-        self.client = cohere.ClientV2(api_key)
+        # Shared keep-alive HTTP/2 pool: repeated chat calls skip the TCP/TLS handshake
+        # and concurrent calls multiplex over the same connection
+        self.httpx_client = httpx.Client(
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=30.0
+            )
+        )
+        self.client = cohere.ClientV2(api_key=api_key, httpx_client=self.httpx_client)
         self.api_key = api_key
+        self._call_slots = threading.BoundedSemaphore(self.MAX_CONCURRENT_CALLS)
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._inflight: Dict[str, dict] = {}
+        self.chat_latency = chat_latency
+        
+        if redis_url is None:
+            redis_url = os.getenv("REDIS_URL")
+        self.redis = None
+        if redis_url and REDIS_AVAILABLE:
+            self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
     
-    def parse_car_query(self, user_prompt: str) -> Dict[str, any]:
+    def parse_car_query(self, user_prompt: str) -> ParsedQuery:
         """
         Parse a natural language car search query into structured parameters.
         
@@ -48,65 +197,181 @@ class CohereAPI:
             user_prompt: User's natural language description of desired car.
         
         Returns:
-            Dictionary containing parsed parameters:
-            {
-                'maximumPrice': int,
-                'maximumMileage': int,
-                'minYear': int,
-                'maxYear': int,
-                'color': str or None,
-                'make': str or None,
-                'model': str or None,
-                'carType': str or None
-            }
+            ParsedQuery with price, mileage, year range, color, make, model and car type.
+            Its error field is set instead if the prompt does not relate to cars.
         
         Raises:
             Exception: If API call fails or response cannot be parsed.
         """
-        # Enhanced prompt for Cohere
-        enhanced_prompt = (
-            user_prompt + 
-            " Please take the prompt above and isolate the desired model, make, year range, "
-            "maximum price, color, maximum mileage, and car type. "
-            "If the prompt given does not relate to cars please ignore the prompt entirely and "
-            "print nothing more than 'this prompt does not relate to cars'. "
-            "If an exact color is not specified please return it as null, a color should be given "
-            "if it is a very general color ex(red orange yellow green blue, black, white, silver "
-            "NOT matte black or platinum silver) if the given prompt does not include information "
-            "for Color, Make or Model and car types please return it as 'null'. "
-            "If the prompt does not specify an exact number for miles or price use judgement of what "
-            "the prompt seems to want and give a number for example if asked for a car with low mileage "
-            "do NOT return 'low mileage' return something like 5000. "
-            "If multiple makes are given please select only 1. "
-            "Possible car types are Convertible, Coupe, Hatchback, hybrid, Sedan, SUV, Minivan, Pickup Truck, "
-            "if one of these is not specified please return null. "
-            "If it does not include information for Maximum Price, Maximum Mileage, or Min year please "
-            "return it as 0, for max year please return the current year(2026). "
-            "Do not include any additional text. The current year is 2026. "
-            "Please format the output as: "
-            "Maximum Price: Maximum Mileage: Car type: Color: Make: Model: Minimum Year: Maximum Year:"
-        )
+        cache_key = self._normalize_prompt(user_prompt)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Coalesce identical prompts that arrive while a Cohere call is already in flight
+        with self._cache_lock:
+            # Re-check under the lock: a leader may have stored the result and left since the lookup above
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                return cached
+            pending = self._inflight.get(cache_key)
+            is_leader = pending is None
+            if is_leader:
+                pending = self._inflight[cache_key] = {"done": threading.Event()}
+        
+        if not is_leader:
+            pending["done"].wait()
+            if "exception" in pending:
+                raise pending["exception"]
+            return pending["result"]
         
         try:
-            response = self.client.chat(
-                model="command-a-03-2025",
-                messages=[{"role": "user", "content": enhanced_prompt}]
-            )
+            parsed = self._redis_get(cache_key)
+            if parsed is None:
+                parsed = self._request_parse(user_prompt)
+                self._redis_set(cache_key, parsed)
+            self._cache_put(cache_key, parsed)
+            pending["result"] = parsed
+            return parsed
+        except Exception as e:
+            pending["exception"] = e
+            raise
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(cache_key, None)
+            pending["done"].set()
+    
+    def _request_parse(self, user_prompt: str) -> ParsedQuery:
+        """
+        Send the prompt to Cohere and parse the reply (no caching).
+        
+        Args:
+            user_prompt: User's natural language description of desired car.
+        
+        Returns:
+            ParsedQuery (error set for non-car prompts).
+        
+        Raises:
+            Exception: If API call fails or response cannot be parsed.
+        """
+        try:
+            with self._call_slots:
+                # Timed inside the semaphore, so waiting for a call slot is not counted
+                start = time.perf_counter()
+                try:
+                    response = self.client.chat(
+                        model=self.PARSE_MODEL,
+                        # Fixed system message first, so every request shares the same prefix
+                        messages=[_SYSTEM_MESSAGE, {"role": "user", "content": user_prompt}],
+                        response_format=_RESPONSE_FORMAT,
+                        max_tokens=self.PARSE_MAX_TOKENS
+                    )
+                finally:
+                    self._record_chat_latency(time.perf_counter() - start)
             
             # Handle Cohere API response - check different possible response formats
             raw_text = self._extract_response_text(response)
             
-            # Check if response indicates non-car related query
-            if "does not relate to cars" in raw_text.lower():
-                return {"error": "Your query does not relate to cars. Please try again with a car-related search."}
-            
-            # Parse the response into structured format
+            # Parse the JSON reply into structured format
             return self._parse_response(raw_text)
             
         except Exception as e:
-            print(f"Error in Cohere API call: {e}")
+            logger.warning("Error in Cohere API call: %s", e)
             raise Exception(f"Cohere API error: {str(e)}")
     
+    def _record_chat_latency(self, elapsed: float) -> None:
+        """Observe one chat call's duration and warn when it is slow."""
+        if self.chat_latency is not None:
+            self.chat_latency.observe(elapsed)
+        if elapsed > self.SLOW_CHAT_SECONDS:
+            logger.warning("Slow Cohere chat: %.2fs", elapsed)
+    
+    def warm_up(self) -> None:
+        """
+        Open a keep-alive connection to Cohere with a one-token chat call,
+        so the first user search does not pay the TCP/TLS handshake.
+        """
+        try:
+            self.client.chat(
+                model=self.PARSE_MODEL,
+                messages=[{"role": "user", "content": "ping"}],
+                max_tokens=1
+            )
+        except Exception as e:
+            logger.info("Cohere warm-up skipped: %s", e)
+    
+    @staticmethod
+    def _normalize_prompt(user_prompt: str) -> str:
+        """Lowercase and collapse whitespace so trivially different prompts share a cache entry."""
+        return " ".join(str(user_prompt).lower().split())
+    
+    def _cache_get(self, key: str) -> Optional[ParsedQuery]:
+        """
+        Return the cached parse for key, or None if missing or expired.
+        
+        Args:
+            key: Normalized prompt.
+        
+        Returns:
+            ParsedQuery or None.
+        """
+        with self._cache_lock:
+            return self._cache_lookup(key)
+    
+    def _cache_lookup(self, key: str) -> Optional[ParsedQuery]:
+        """_cache_get without locking; the caller must hold _cache_lock."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, parsed = entry
+        if time.monotonic() - stored_at > self.CACHE_TTL_SECONDS:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return parsed
+    
+    def _cache_put(self, key: str, parsed: ParsedQuery) -> None:
+        """
+        Store a parse result, evicting the least recently used entry when full.
+        
+        Args:
+            key: Normalized prompt.
+            parsed: Parsed query.
+        """
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), parsed)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+    
+    def _redis_get(self, key: str) -> Optional[ParsedQuery]:
+        """
+        Read a parse stored by any worker from Redis.
+        
+        Args:
+            key: Normalized prompt.
+        
+        Returns:
+            ParsedQuery, or None if absent/unavailable.
+        """
+        if self.redis is None:
+            return None
+        try:
+            value = self.redis.get(self.REDIS_KEY_PREFIX + key)
+            return ParsedQuery(**orjson.loads(value)) if value is not None else None
+        except Exception as e:
+            logger.warning("Redis parse cache read failed: %s", e)
+            return None
+    
+    def _redis_set(self, key: str, parsed: ParsedQuery) -> None:
+        """Write a parse to Redis with REDIS_TTL_SECONDS; failures are ignored."""
+        if self.redis is None:
+            return
+        try:
+            self.redis.setex(self.REDIS_KEY_PREFIX + key, self.REDIS_TTL_SECONDS, orjson.dumps(parsed))
+        except Exception as e:
+            logger.warning("Redis parse cache write failed: %s", e)
+    
     def _extract_response_text(self, response) -> str:
         """
         Extract text from Cohere API response, handling different response formats.
@@ -129,40 +394,37 @@ class CohereAPI:
             else:
                 return str(response)
         except Exception as e:
-            print(f"Error parsing Cohere response: {e}")
+            logger.warning("Error parsing Cohere response: %s", e)
             return ""
     
-    def _parse_response(self, raw_text: str) -> Dict[str, any]:
+    def _parse_response(self, raw_text: str) -> ParsedQuery:
         """
-        Parse Cohere response text into structured dictionary.
+        Parse Cohere's JSON reply into structured dictionary.
         
         Args:
-            raw_text: Raw text response from Cohere API.
+            raw_text: Raw JSON text response from Cohere API.
         
         Returns:
-            Dictionary with parsed parameters.
-        """
-        def safe_int(value, default=0):
-            """Safely convert value to integer."""
-            try:
-                return int(float(str(value).replace(",", "")))
-            except:
-                return default
-        
-        parsed = {}
-        for line in raw_text.split("\n"):
-            if ":" in line:
-                key, value = map(str.strip, line.split(":", 1))
-                parsed[key.strip()] = value.strip()
-        
-        return {
-            'maximumPrice': safe_int(parsed.get("Maximum Price", 0)),
-            'maximumMileage': safe_int(parsed.get("Maximum Mileage", 0)),
-            'minYear': safe_int(parsed.get("Minimum Year", 0)),
-            'maxYear': safe_int(parsed.get("Maximum Year", 2026)),
-            'color': parsed.get("Color", "Null") if parsed.get("Color", "Null").lower() != "null" else None,
-            'make': parsed.get("Make", "Null") if parsed.get("Make", "Null").lower() != "null" else None,
-            'model': parsed.get("Model", "Null") if parsed.get("Model", "Null").lower() != "null" else None,
-            'carType': parsed.get("Car type", "Null") if parsed.get("Car type", "Null").lower() != "null" else None,
-        }
-
+            ParsedQuery (error set for non-car prompts).
+        
+        Raises:
+            orjson.JSONDecodeError: If the reply is not valid JSON.
+            ValueError: If the reply is JSON but not an object.
+        """
+        data = orjson.loads(raw_text)
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a JSON object from Cohere, got {type(data).__name__}")
+        
+        if data.get("not_car_related"):
+            return ParsedQuery(error="Your query does not relate to cars. Please try again with a car-related search.")
+        
+        return ParsedQuery(
+            maximum_price=safe_int(data.get("maximumPrice", 0)),
+            maximum_mileage=safe_int(data.get("maximumMileage", 0)),
+            min_year=safe_int(data.get("minYear", 0)),
+            max_year=safe_int(data.get("maxYear", 2026), 2026),
+            color=_optional_text(data.get("color")),
+            make=_optional_text(data.get("make")),
+            model=_optional_text(data.get("model")),
+            car_type=_optional_text(data.get("carType")),
+        )
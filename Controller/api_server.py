@@ -6,11 +6,16 @@ Uses object-oriented service layer for abstraction.
 Request/response validated via Controller.services.schemas (Pydantic).
 """
 
+import hashlib
+import logging
 import os
 import sys
-import warnings
+import time
+from decimal import Decimal
 from pathlib import Path
-from flask import Flask, request, jsonify
+import orjson
+from flask import Flask, g, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from dotenv import load_dotenv
 from pydantic import ValidationError
@@ -23,25 +28,74 @@ sys.path.insert(0, str(project_root))
 load_dotenv(project_root / ".env")
 
 # Import services from their respective locations
-from Cohere import CohereAPI
-from Pexels import PexelsAPI
-from Database_Model_Connection import SupabaseService
-from Controller.services import BackendService
+from Controller.services import BackendService, get_cohere_api, get_pexels_api, get_supabase_service
 from Controller.services.schemas import (
     SearchRequest,
+    BatchSearchRequest,
+    BatchSearchResult,
+    BatchSearchResponse,
     FilteredSearchRequest,
     SearchResponse,
-    CarsListResponse,
     CarResponse,
     HealthResponse,
     ErrorResponse,
 )
+from Controller.services.metrics import CONTENT_TYPE_LATEST, REQUEST_LATENCY, render_metrics
+from Controller.services.response_cache import ResponseCache
+from Controller.services.logging_config import configure_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Try to import flask-compress for gzip/brotli response compression
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
+# Result images (Pexels hits and fallbacks) are all served from this origin
+IMAGE_ORIGIN = "https://images.pexels.com"
+
+
+def _orjson_default(obj):
+    """Serialize values orjson does not handle natively (numeric columns can arrive as Decimal)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(payload) -> bytes:
+    """Serialize payload to JSON bytes with orjson."""
+    return orjson.dumps(payload, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify and request.get_json use it too."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return _dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
-# Suppress Pydantic V1 compatibility warning from cohere library
-warnings.filterwarnings("ignore", message=".*Pydantic V1.*")
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Compress JSON responses (repeated keys and image URL prefixes shrink well).
+# Streamed responses are left alone so NDJSON/streamed cars still arrive incrementally.
+if COMPRESS_AVAILABLE:
+    app.config.update(
+        COMPRESS_ALGORITHM=["br", "gzip"],
+        COMPRESS_MIMETYPES=["application/json"],
+        COMPRESS_MIN_SIZE=500,
+        COMPRESS_LEVEL=4,
+        COMPRESS_BR_LEVEL=4,
+        COMPRESS_STREAMS=False,
+    )
+    Compress(app)
 
 # Configure CORS - allow requests from frontend
 CORS(app, origins=["http://localhost:8080", "http://127.0.0.1:8080", "http://localhost:5001"])
@@ -52,32 +106,160 @@ try:
     # Initialize individual services and pass them to BackendService
     # BackendService will use these services - api_server doesn't need direct access
     backend_service = BackendService(
-        cohere_api=CohereAPI(),
-        supabase_service=SupabaseService(),
-        pexels_api=PexelsAPI()
+        cohere_api=get_cohere_api(),
+        supabase_service=get_supabase_service(),
+        pexels_api=get_pexels_api()
     )
     print("✅ Service layer initialized successfully")
     print(f"   - BackendService: {backend_service.__class__.__name__}")
     print(f"   - CohereAPI: {backend_service.cohere_api.__class__.__name__}")
     print(f"   - SupabaseService: {backend_service.supabase_service.__class__.__name__}")
     print(f"   - PexelsAPI: {backend_service.pexels_api.__class__.__name__}")
+    # Runs once per process (each gunicorn worker imports this module after forking)
+    backend_service.warm_up()
 except Exception as e:
     raise ConnectionError(f"Failed to initialize service layer: {e}")
 
+# Serialized search responses, keyed by endpoint + inputs (shared via Redis when REDIS_URL is set)
+response_cache = ResponseCache(max_entries=1024, ttl_seconds=300)
+
+
+def _json_response(payload, status: int = 200):
+    """Serialize payload with orjson and wrap it in a JSON response."""
+    return app.response_class(_dumps(payload), status=status, mimetype="application/json")
+
+
+def _prefetch_urls(car_responses) -> list:
+    """Return the distinct image URLs of the result cars, in display order."""
+    return list(dict.fromkeys(c.imageUrl for c in car_responses if c.imageUrl))
+
+
+def _with_prefetch_links(response, urls):
+    """Add Link rel=prefetch headers so the browser can fetch result images while idle."""
+    for url in urls:
+        response.headers.add("Link", f"<{url}>; rel=prefetch; as=image")
+    return response
+
+
+def _cacheable_response(cache_key, body):
+    """Serialize a response model, cache the bytes under cache_key, and return the response."""
+    payload = _dumps(body.model_dump(exclude_none=True))
+    response_cache.put(cache_key, payload, body.prefetchUrls)
+    return _cached_response((payload, body.prefetchUrls))
+
+
+def _cached_response(entry):
+    """Build a 200 JSON response from a cached (body bytes, prefetch URLs) entry."""
+    payload, prefetch_urls = entry
+    response = app.response_class(payload, status=200, mimetype="application/json")
+    return _with_prefetch_links(response, prefetch_urls)
+
+
+def _data_etag(*parts):
+    """
+    Build an ETag from the request inputs and the shared listings data version,
+    so it can be checked before any database work.
+
+    Returns:
+        ETag string, or None without Redis (data changes could not be detected).
+    """
+    version = response_cache.data_version()
+    if version is None:
+        return None
+    return hashlib.blake2b(repr((version,) + parts).encode(), digest_size=12).hexdigest()
+
+
+def _parse_request(schema):
+    """
+    Parse and validate the raw JSON body against a request schema in a single
+    pydantic-core pass (no intermediate dict from a separate JSON decode).
+
+    Returns:
+        (request model, None) on success, or (None, error response).
+    """
+    if not request.is_json:
+        return None, _invalid_json_response()
+    try:
+        return schema.model_validate_json(request.get_data(cache=False)), None
+    except ValidationError as e:
+        if any(err["type"] == "json_invalid" for err in e.errors()):
+            return None, _invalid_json_response()
+        return None, _validation_error_response(e)
+
+
+def _invalid_json_response():
+    """Return 400 JSON for a missing or malformed request body."""
+    return _json_response(ErrorResponse(error="Request body must be valid JSON").model_dump(), 400)
+
 
 def _validation_error_response(exc: ValidationError):
     """Return 422 JSON for Pydantic validation errors."""
     errors = [{"loc": e["loc"], "msg": e["msg"]} for e in exc.errors()]
-    return jsonify({"error": "Validation failed", "details": errors}), 422
+    return _json_response({"error": "Validation failed", "details": errors}, 422)
+
+
+@app.before_request
+def _start_timer():
+    """Record request start time for the latency histogram."""
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _record_latency(response):
+    """Observe handler latency per endpoint."""
+    start = g.pop("request_start", None)
+    if start is not None and request.endpoint:
+        REQUEST_LATENCY.labels(endpoint=request.endpoint).observe(time.perf_counter() - start)
+    return response
+
+
+@app.after_request
+def _add_image_preconnect(response):
+    """Let the browser resolve and connect to the image host while it parses the JSON."""
+    response.headers.add("Link", f"<{IMAGE_ORIGIN}>; rel=preconnect")
+    response.headers.add("Link", f"<{IMAGE_ORIGIN}>; rel=dns-prefetch")
+    return response
 
 
 # API Routes
 
+# Health probes hit this constantly; the body never changes, so serialize it once
+_HEALTH_BODY = _dumps(HealthResponse(status="healthy", message="ReCarmend API is running").model_dump())
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    body = HealthResponse(status="healthy", message="ReCarmend API is running")
-    return jsonify(body.model_dump()), 200
+    return app.response_class(_HEALTH_BODY, status=200, mimetype="application/json")
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics endpoint (Cohere, Supabase, and handler latency)."""
+    return app.response_class(render_metrics(), status=200, content_type=CONTENT_TYPE_LATEST)
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Image URL cache statistics (hits, misses, size)."""
+    return _json_response({"images": backend_service.pexels_api.cache_stats()}, 200)
+
+
+def _ai_search_body(query: str, search_result: dict, response_model=SearchResponse):
+    """Build the AI search response model from a successful BackendService.ai_search result."""
+    cars = search_result.get("results", [])
+    has_more = len(cars) == 10
+    car_responses = [CarResponse.model_validate(c) for c in cars]
+    return response_model(
+        cars=car_responses,
+        count=len(car_responses),
+        query=query,
+        hasMore=has_more,
+        totalCount=len(car_responses),
+        last_id=search_result.get("last_id"),
+        message="Showing 10 results. More cars available - search again to see more." if has_more else None,
+        prefetchUrls=_prefetch_urls(car_responses),
+    )
 
 
 @app.route('/api/search', methods=['POST'])
@@ -85,42 +267,94 @@ def search():
     """
     AI-powered search endpoint.
     Request body: SearchRequest (query: str, optional last_id: int).
-    Response: SearchResponse (cars, count, query, hasMore, last_id?, message?).
+    Response: SearchResponse (cars, count, query, hasMore, last_id?, message?, prefetchUrls).
     """
     try:
-        data = request.get_json()
-        if data is None:
-            return jsonify(ErrorResponse(error="Request body must be JSON").model_dump()), 400
-        try:
-            req = SearchRequest.model_validate(data)
-        except ValidationError as e:
-            return _validation_error_response(e)
+        req, error_response = _parse_request(SearchRequest)
+        if error_response is not None:
+            return error_response
         query = req.query.strip()
         if not query:
-            return jsonify(ErrorResponse(error="Query cannot be empty").model_dump()), 400
+            return _json_response(ErrorResponse(error="Query cannot be empty").model_dump(), 400)
+
+        cache_key = ("search", query, req.last_id)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return _cached_response(cached)
 
         search_result = backend_service.ai_search(query, last_id=req.last_id)
-        if isinstance(search_result, dict) and "error" in search_result:
-            return jsonify(ErrorResponse(error=search_result["error"]).model_dump()), 400
+        if "error" in search_result:
+            return _json_response(ErrorResponse(error=search_result["error"]).model_dump(), 400)
 
-        cars = search_result.get("results", [])
-        last_car_id = search_result.get("last_id")
-        has_more = len(cars) == 10
+        # Same CarResponse validation and serialization as /api/search/batch and /api/search/stream
+        return _cacheable_response(cache_key, _ai_search_body(query, search_result))
+    except Exception as e:
+        logger.exception("Error in /api/search")
+        return _json_response(ErrorResponse(error=f"Internal server error: {str(e)}").model_dump(), 500)
 
-        car_responses = [CarResponse.model_validate(c) for c in cars]
-        body = SearchResponse(
-            cars=car_responses,
-            count=len(car_responses),
-            query=query,
-            hasMore=has_more,
-            totalCount=len(car_responses),
-            last_id=last_car_id,
-            message="Showing 10 results. More cars available - search again to see more." if has_more else None,
-        )
-        return jsonify(body.model_dump(exclude_none=True)), 200
+
+@app.route('/api/search/stream', methods=['POST'])
+def search_stream():
+    """
+    AI-powered search that streams results as NDJSON, so cars render before every image is found.
+    Request body: SearchRequest (query: str, optional last_id: int).
+    Response lines: {count, query, hasMore, last_id?} first, then one CarResponse per car
+    in the order their images resolve.
+    """
+    try:
+        req, error_response = _parse_request(SearchRequest)
+        if error_response is not None:
+            return error_response
+        query = req.query.strip()
+        if not query:
+            return _json_response(ErrorResponse(error="Query cannot be empty").model_dump(), 400)
+
+        search_result = backend_service.ai_search(query, last_id=req.last_id, include_images=False)
+        if "error" in search_result:
+            return _json_response(ErrorResponse(error=search_result["error"]).model_dump(), 400)
     except Exception as e:
-        print(f"Error in /api/search: {e}")
-        return jsonify(ErrorResponse(error=f"Internal server error: {str(e)}").model_dump()), 500
+        logger.exception("Error in /api/search/stream")
+        return _json_response(ErrorResponse(error=f"Internal server error: {str(e)}").model_dump(), 500)
+
+    cars = search_result.get("results", [])
+    header = {"count": len(cars), "query": query, "hasMore": len(cars) == 10}
+    if search_result.get("last_id") is not None:
+        header["last_id"] = search_result["last_id"]
+
+    def generate():
+        yield _dumps(header) + b"\n"
+        for car in backend_service.iter_with_images(cars):
+            yield _dumps(CarResponse.model_validate(car).model_dump(exclude_none=True)) + b"\n"
+
+    return app.response_class(stream_with_context(generate()), status=200, mimetype="application/x-ndjson")
+
+
+@app.route('/api/search/batch', methods=['POST'])
+def search_batch():
+    """
+    Run several AI-powered searches in one request; the searches run concurrently.
+    Request body: BatchSearchRequest (queries: list[str], 1-10 items).
+    Response: BatchSearchResponse (results: one BatchSearchResult per query, same order).
+    """
+    try:
+        req, error_response = _parse_request(BatchSearchRequest)
+        if error_response is not None:
+            return error_response
+        queries = [q.strip() for q in req.queries]
+        if not all(queries):
+            return _json_response(ErrorResponse(error="Queries cannot be empty").model_dump(), 400)
+
+        results = []
+        for query, search_result in zip(queries, backend_service.ai_search_batch(queries)):
+            if "error" in search_result:
+                results.append(BatchSearchResult(cars=[], count=0, query=query, error=search_result["error"]))
+            else:
+                results.append(_ai_search_body(query, search_result, BatchSearchResult))
+        body = BatchSearchResponse(results=results)
+        return _json_response(body.model_dump(exclude_none=True), 200)
+    except Exception as e:
+        logger.exception("Error in /api/search/batch")
+        return _json_response(ErrorResponse(error=f"Internal server error: {str(e)}").model_dump(), 500)
 
 
 @app.route('/api/search/filtered', methods=['POST'])
@@ -128,18 +362,19 @@ def filtered_search():
     """
     Filter-based search endpoint.
     Request body: FilteredSearchRequest (filters: FilterSchema, optional last_id: int).
-    Response: SearchResponse (cars, count, hasMore, totalCount, last_id?, message?).
+    Response: SearchResponse (cars, count, hasMore, totalCount, last_id?, message?, prefetchUrls).
     """
     try:
-        data = request.get_json()
-        if data is None:
-            return jsonify(ErrorResponse(error="Request body must be JSON").model_dump()), 400
-        try:
-            req = FilteredSearchRequest.model_validate(data)
-        except ValidationError as e:
-            return _validation_error_response(e)
+        req, error_response = _parse_request(FilteredSearchRequest)
+        if error_response is not None:
+            return error_response
 
         filters_dict = req.filters.model_dump(exclude_none=True)
+        cache_key = ("filtered", orjson.dumps(filters_dict, option=orjson.OPT_SORT_KEYS), req.last_id)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return _cached_response(cached)
+
         results, has_more, total_count, last_car_id = backend_service.filtered_search(
             filters_dict,
             return_has_more=True,
@@ -154,11 +389,12 @@ def filtered_search():
             totalCount=total_count,
             last_id=last_car_id,
             message=f"Showing 10 of {total_count} results. Search again to see more cars." if has_more else None,
+            prefetchUrls=_prefetch_urls(car_responses),
         )
-        return jsonify(body.model_dump(exclude_none=True)), 200
+        return _cacheable_response(cache_key, body)
     except Exception as e:
-        print(f"Error in /api/search/filtered: {e}")
-        return jsonify(ErrorResponse(error=f"Internal server error: {str(e)}").model_dump()), 500
+        logger.exception("Error in /api/search/filtered")
+        return _json_response(ErrorResponse(error=f"Internal server error: {str(e)}").model_dump(), 500)
 
 
 @app.route('/api/cars', methods=['GET'])
@@ -166,21 +402,50 @@ def get_cars():
     """
     Get all cars (for testing/debugging).
     Query params: limit (optional, default 10, max 100).
-    Response: CarsListResponse (cars, count).
+    Response: CarsListResponse (cars, count, prefetchUrls), streamed as each batch of
+    10 cars is formatted so the first cars go out before the last images are found.
+    With REDIS_URL set, responses carry an ETag tied to the listings data version and
+    If-None-Match requests get 304 until the next upload.
     """
     try:
         limit = request.args.get("limit", 10, type=int)
         if limit is None or limit < 1:
             limit = 10
         limit = min(limit, 100)
+        etag = _data_etag("cars", limit)
+        if etag is not None and request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
         cars = backend_service.supabase_service.get_all_cars(limit)
-        formatted_cars = backend_service.format_car_results(cars)
-        car_responses = [CarResponse.model_validate(c) for c in formatted_cars]
-        body = CarsListResponse(cars=car_responses, count=len(car_responses))
-        return jsonify(body.model_dump()), 200
     except Exception as e:
-        print(f"Error in /api/cars: {e}")
-        return jsonify(ErrorResponse(error=f"Internal server error: {str(e)}").model_dump()), 500
+        logger.exception("Error in /api/cars")
+        return _json_response(ErrorResponse(error=f"Internal server error: {str(e)}").model_dump(), 500)
+
+    def generate():
+        count = 0
+        prefetch_urls = {}
+        yield b'{"cars":['
+        try:
+            for car in backend_service.iter_format_car_results(cars):
+                car_response = CarResponse.model_validate(car)
+                if count:
+                    yield b","
+                yield _dumps(car_response.model_dump())
+                count += 1
+                if car_response.imageUrl:
+                    prefetch_urls[car_response.imageUrl] = None
+        except Exception:
+            # Headers are already sent, so end the document cleanly with what was written
+            logger.exception("Error in /api/cars")
+        yield b'],"count":' + str(count).encode() + b',"prefetchUrls":' + _dumps(list(prefetch_urls)) + b"}"
+
+    response = app.response_class(stream_with_context(generate()), status=200, mimetype="application/json")
+    if etag is not None:
+        # Revalidate on every use; unchanged data costs a 304 with no database or image work
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+    return response
 
 
 if __name__ == '__main__':
@@ -188,9 +453,14 @@ if __name__ == '__main__':
     print("📡 API will be available at http://localhost:5001")
     print("📝 Endpoints:")
     print("   - POST /api/search - AI-powered search")
+    print("   - POST /api/search/stream - AI-powered search, streamed as NDJSON")
+    print("   - POST /api/search/batch - Several AI-powered searches at once")
     print("   - POST /api/search/filtered - Filter-based search")
     print("   - GET /api/cars - Get all cars")
     print("   - GET /api/health - Health check")
-    app.run(debug=True, host='0.0.0.0', port=5001)
-
-
+    print("   - GET /api/cache/stats - Image cache statistics")
+    print("   - GET /metrics - Prometheus latency metrics")
+    print("   (dev server - use gunicorn -c Controller/gunicorn.conf.py Controller.api_server:app in production)")
+    # threaded=True: each request gets its own thread, so one slow Cohere/Supabase
+    # round-trip does not block other searches
+    app.run(debug=os.getenv("FLASK_DEBUG", "1") == "1", host='0.0.0.0', port=5001, threaded=True)
@@ -5,8 +5,12 @@ This module is responsible for running scrapers on a schedule (e.g., weekly).
 Uses ScrapingController to perform the actual scraping operations.
 After scraping, uploads data to Supabase with randomized order.
 """
+import csv
+import logging
 import time
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -35,8 +39,18 @@ except ImportError:
     except ImportError:
         from scraping_controller import ScrapingController
 
-# Import SupabaseService from Database_Model_Connection
-from Database_Model_Connection import SupabaseService
+# Shared service clients for this process (see Controller/services/service_factory.py)
+from Controller.services.service_factory import get_pexels_api, get_supabase_service
+from Controller.services.response_cache import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+
+def _log_banner(message: str) -> None:
+    """Log message between two '=' rules (no-op when INFO logging is disabled)."""
+    if logger.isEnabledFor(logging.INFO):
+        rule = "=" * 70
+        logger.info("\n%s\n%s\n%s\n", rule, message, rule)
 
 
 class DataMaintenance:
@@ -45,10 +59,15 @@ class DataMaintenance:
     Handles scheduling and execution of periodic scraping operations.
     """
     
+    # Pexels allows 200 searches per hour; leave headroom for live API traffic
+    IMAGE_WARMUP_MAX_SEARCHES = 150
+    # Concurrent Pexels searches during warm-up (bounded by the session's pool of 20)
+    IMAGE_WARMUP_WORKERS = 8
+    
     def __init__(self):
         """Initialize the data maintenance scheduler."""
         self.controller = ScrapingController()
-        self.supabase_service = SupabaseService()
+        self.supabase_service = get_supabase_service()
         self.last_run: datetime | None = None
     
     def run_weekly_update(
@@ -63,43 +82,85 @@ class DataMaintenance:
             single_site: If set (e.g. "carpages"), scrape only this site; otherwise scrape all websites.
         """
         label = f"Scraping {single_site}..." if single_site else "Scraping websites..."
-        print(f"\n{'='*70}")
-        print(f"🔄 Starting weekly data update - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"{'='*70}\n")
+        _log_banner(f"🔄 Starting weekly data update - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         try:
             # Step 1: Run scraper(s) (saves to CSV files)
-            print(f"📥 Step 1: {label}")
+            logger.info("📥 Step 1: %s", label)
             if single_site:
                 self.controller.scrape_website(single_site)
             else:
                 self.controller.scrape_all_websites()
-            print("\n✅ Scraping completed successfully")
+            logger.info("✅ Scraping completed successfully")
             
             # Step 2: Upload to Supabase (with randomized order)
             if upload_to_supabase:
-                print(f"\n{'='*70}")
-                print("📤 Step 2: Uploading to Supabase...")
-                print(f"{'='*70}\n")
+                _log_banner("📤 Step 2: Uploading to Supabase...")
                 try:
                     rows_uploaded = self.supabase_service.upload_all_listings(
                         clear_table_flag=True,  # Clear existing data
                         reset_id=True  # Reset IDs to start from 1
                     )
-                    print(f"\n✅ Upload completed: {rows_uploaded} rows uploaded to Supabase")
+                    logger.info("✅ Upload completed: %s rows uploaded to Supabase", rows_uploaded)
+                    # New data: drop cached responses and ETags in every API worker
+                    if bump_data_version():
+                        logger.info("🔁 API response caches invalidated")
                 except Exception as upload_error:
-                    print(f"\n❌ Upload to Supabase failed: {upload_error}")
-                    print("⚠️  Scraping completed, but data was not uploaded to database")
+                    logger.error("❌ Upload to Supabase failed: %s", upload_error)
+                    logger.warning("⚠️  Scraping completed, but data was not uploaded to database")
                     raise
+                
+                # Step 3: Resolve listing images now, so searches don't wait on Pexels
+                logger.info("🖼️  Step 3: Warming image cache...")
+                try:
+                    self.warm_image_cache()
+                except Exception as warm_error:
+                    logger.warning("⚠️  Image cache warm-up failed: %s", warm_error)
             
             self.last_run = datetime.now()
-            print(f"\n{'='*70}")
-            print(f"✅ Weekly update completed successfully at {self.last_run.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"{'='*70}\n")
+            _log_banner(f"✅ Weekly update completed successfully at {self.last_run.strftime('%Y-%m-%d %H:%M:%S')}")
         except Exception as e:
-            print(f"\n❌ Weekly update failed: {e}")
+            logger.error("❌ Weekly update failed: %s", e)
             raise
     
+    def warm_image_cache(self, csv_file_path: Path | None = None) -> int:
+        """
+        Look up listing images ahead of time and store them in the shared Redis
+        image cache, so API searches after an upload skip the Pexels round-trip.
+        The most common make/models go first, one Pexels search each.
+        
+        Args:
+            csv_file_path: Listings CSV. If None, uses data/all_listings.csv
+        
+        Returns:
+            Number of distinct listing images looked up (0 if skipped)
+        """
+        pexels_api = get_pexels_api()
+        if pexels_api.redis is None or not pexels_api.api_key:
+            logger.warning("⚠️  Image warm-up skipped (needs REDIS_URL and PEXELS_API_KEY)")
+            return 0
+        
+        if csv_file_path is None:
+            csv_file_path = project_root / "data" / "all_listings.csv"
+        with open(csv_file_path, newline="", encoding="utf-8") as f:
+            rows = [
+                (row.get("make"), row.get("model"), row.get("year"), row.get("color"))
+                for row in csv.DictReader(f)
+                if row.get("make") and row.get("model")
+            ]
+        
+        group_counts = Counter((make.strip().lower(), model.strip().lower()) for make, model, _, _ in rows)
+        top_groups = {group for group, _ in group_counts.most_common(self.IMAGE_WARMUP_MAX_SEARCHES)}
+        lookups = list(dict.fromkeys(
+            row for row in rows if (row[0].strip().lower(), row[1].strip().lower()) in top_groups
+        ))
+        
+        # Searches are independent per make/model, so overlap their network waits
+        with ThreadPoolExecutor(max_workers=self.IMAGE_WARMUP_WORKERS) as executor:
+            pexels_api.get_car_image_urls(lookups, executor=executor)
+        logger.info("✅ Image cache warmed: %d listing images across %d make/models", len(lookups), len(top_groups))
+        return len(lookups)
+    
     def schedule_weekly_updates(self, day_of_week: str = "monday", time: str = "09:00") -> None:
         """
         Schedule weekly scraping updates.
@@ -112,7 +173,7 @@ class DataMaintenance:
             raise ImportError("The 'schedule' module is required for scheduling. Install it with: pip install schedule")
         # Schedule weekly updates
         getattr(schedule.every(), day_of_week.lower()).at(time).do(self.run_weekly_update)
-        print(f"📅 Scheduled weekly updates: Every {day_of_week} at {time}")
+        logger.info("📅 Scheduled weekly updates: Every %s at %s", day_of_week, time)
     
     def run_scheduler(self) -> None:
         """
@@ -121,15 +182,21 @@ class DataMaintenance:
         """
         if schedule is None:
             raise ImportError("The 'schedule' module is required for scheduling. Install it with: pip install schedule")
-        print("🚀 Data maintenance scheduler started")
-        print("Press Ctrl+C to stop\n")
+        logger.info("🚀 Data maintenance scheduler started")
+        logger.info("Press Ctrl+C to stop")
         
         try:
             while True:
+                # Sleep exactly until the next job is due instead of polling every minute
+                idle = schedule.idle_seconds()
+                if idle is None:
+                    logger.info("No scheduled jobs - scheduler exiting")
+                    break
+                if idle > 0:
+                    time.sleep(idle)
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
         except KeyboardInterrupt:
-            print("\n\n⏹️  Scheduler stopped by user")
+            logger.info("⏹️  Scheduler stopped by user")
     
     def run_manual_update(
         self, upload_to_supabase: bool = True, single_site: str | None = None
@@ -141,7 +208,7 @@ class DataMaintenance:
             upload_to_supabase: If True, uploads scraped data to Supabase after scraping (default: True)
             single_site: If set (e.g. "carpages"), scrape only this site; otherwise scrape all websites.
         """
-        print("🔧 Running manual data update...")
+        logger.info("🔧 Running manual data update...")
         self.run_weekly_update(upload_to_supabase=upload_to_supabase, single_site=single_site)
 
 
@@ -150,6 +217,7 @@ def main():
     Main entry point for data maintenance.
     Runs manual scraping of carpages.ca and uploads to Supabase.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     maintenance = DataMaintenance()
     maintenance.run_manual_update(upload_to_supabase=True, single_site="carpages")
 
@@ -0,0 +1,47 @@
+"""
+Gunicorn configuration for the ReCarmend API server.
+Production alternative to the Flask dev server in api_server.py.
+
+Run from the project root (macOS/Linux):
+    gunicorn -c Controller/gunicorn.conf.py Controller.api_server:app
+"""
+
+import glob
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+
+# gevent workers make outbound Cohere/Supabase/Pexels I/O cooperative,
+# so each worker overlaps many in-flight requests instead of blocking on one
+worker_class = "gevent"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+# Concurrent requests per worker; outbound calls are still bounded by the Cohere
+# semaphore and the Supabase/Pexels connection pools
+worker_connections = int(os.getenv("WORKER_CONNECTIONS", "200"))
+
+# Cohere round-trips plus image lookups can take several seconds
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = 5
+
+# Prometheus multiprocess mode: each worker writes its metrics under this directory,
+# so /metrics aggregates all workers instead of reporting whichever one answered.
+# Set before the workers import prometheus_client.
+if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="recarmend-metrics-")
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+def on_starting(server):
+    """Remove metric files left in a reused PROMETHEUS_MULTIPROC_DIR by a previous run."""
+    for path in glob.glob(os.path.join(os.environ["PROMETHEUS_MULTIPROC_DIR"], "*.db")):
+        os.remove(path)
+
+
+def child_exit(server, worker):
+    """Tell prometheus-client an exited worker's files are no longer live."""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,21 +1,17 @@
-import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Add project root to path for imports
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-# Import scrapers - works both as module and script
+# Import scrapers (project root is on sys.path, so this works both as module and script)
 try:
     from Webscraping.scraper_interface import Scraper
     from Webscraping.carpages_scraper import CarPagesScraper
-except ImportError:
-    try:
-        from Webscraping.scraper_interface import Scraper
-        from Webscraping.carpages_scraper import CarPagesScraper
-    except ImportError:
-        raise ImportError("Could not import Webscraping module. Make sure the project structure is correct.")
+except ImportError as e:
+    raise ImportError("Could not import Webscraping module. Make sure the project structure is correct.") from e
 
 # Future scrapers can be imported here:
 
@@ -38,19 +34,23 @@ class ScrapingController:
     
     def scrape_all_websites(self) -> None:
         """
-        Run all available scrapers.
-        Each scraper creates CSV files directly - no return values.
+        Run all available scrapers concurrently.
+        Each scraper creates its own CSV files directly - no return values, no shared state.
+        Scraping is network-bound, so total time approaches the slowest scraper, not the sum.
         """
-        for scraper_name, scraper in self.scrapers.items():
-
-            print(f"Starting {scraper.get_scraper_name()} scraper...")
-  
+        with ThreadPoolExecutor(max_workers=len(self.scrapers) or 1, thread_name_prefix="scraper") as executor:
+            futures = {}
+            for scraper in self.scrapers.values():
+                print(f"Starting {scraper.get_scraper_name()} scraper...")
+                futures[executor.submit(scraper.scrapeWebsite)] = scraper
             
-            try:
-                scraper.scrapeWebsite()
-                print(f"{scraper.get_scraper_name()} completed successfully")
-            except Exception as e:
-                print(f"{scraper.get_scraper_name()} failed: {e}")
+            for future in as_completed(futures):
+                scraper = futures[future]
+                try:
+                    future.result()
+                    print(f"{scraper.get_scraper_name()} completed successfully")
+                except Exception as e:
+                    print(f"{scraper.get_scraper_name()} failed: {e}")
     
     def scrape_website(self, scraper_name: str) -> None:
         """
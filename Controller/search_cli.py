@@ -0,0 +1,98 @@
+"""
+Search CLI
+Runs AI or filtered searches through BackendService without the API server or a browser,
+so search hot paths can be scripted, benchmarked and profiled.
+
+Usage (from the project root):
+    python -m Controller.search_cli ai "cheap red SUV under 20000"
+    python -m Controller.search_cli filter --json filters.json
+    echo '{"makes": ["Toyota"], "maxPrice": 25000}' | python -m Controller.search_cli filter
+    python -m cProfile -o search.prof -m Controller.search_cli filter --json filters.json
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import orjson
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Load .env from project root only
+try:
+    from dotenv import load_dotenv
+    load_dotenv(project_root / ".env")
+except ImportError:
+    pass
+
+from Controller.services import BackendService
+
+
+def run_search(backend_service: BackendService, mode: str, query: str | None = None,
+               filters: dict | None = None, last_id: int | None = None, format_results: bool = True) -> dict:
+    """
+    Run one search and return the API-shaped result.
+
+    Args:
+        backend_service: Service used to run the search
+        mode: "ai" (natural language query) or "filter" (filter dictionary)
+        query: Natural language query (ai mode)
+        filters: FilterSchema-style dictionary (filter mode)
+        last_id: Cursor for pagination
+        format_results: If False, filter mode returns raw rows (database time only)
+
+    Returns:
+        Dictionary with cars, count, hasMore and last_id (or error)
+    """
+    if mode == "ai":
+        result = backend_service.ai_search(query, last_id=last_id)
+        if "error" in result:
+            return result
+        cars = result["results"]
+        return {"cars": cars, "count": len(cars), "hasMore": len(cars) == 10, "last_id": result["last_id"]}
+
+    cars, has_more, total_count, last_car_id = backend_service.filtered_search(
+        filters or {}, return_has_more=True, last_id=last_id, format_results=format_results
+    )
+    return {"cars": cars, "count": len(cars), "hasMore": has_more, "totalCount": total_count, "last_id": last_car_id}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments, run the search (optionally repeated) and print the JSON result."""
+    parser = argparse.ArgumentParser(description="Run ReCarmend searches from the command line.")
+    parser.add_argument("--last-id", type=int, default=None, help="Pagination cursor (id of the last car of the previous page).")
+    parser.add_argument("--repeat", type=int, default=1, help="Run the search this many times and report timings on stderr.")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    ai_parser = subparsers.add_parser("ai", help="AI-powered search from a natural language query.")
+    ai_parser.add_argument("query", help="Natural language search description.")
+
+    filter_parser = subparsers.add_parser("filter", help="Filter-based search (JSON filters from --json or stdin).")
+    filter_parser.add_argument("--json", type=Path, default=None, help="File with FilterSchema JSON (default: read stdin).")
+    filter_parser.add_argument("--raw", action="store_true", help="Return raw database rows (skip formatting and image lookups).")
+
+    args = parser.parse_args(argv)
+
+    filters = None
+    if args.mode == "filter":
+        raw = args.json.read_bytes() if args.json else sys.stdin.buffer.read()
+        filters = orjson.loads(raw) if raw.strip() else {}
+
+    backend_service = BackendService()
+    result = None
+    for run in range(max(args.repeat, 1)):
+        start = time.perf_counter()
+        result = run_search(backend_service, args.mode, query=getattr(args, "query", None),
+                            filters=filters, last_id=args.last_id,
+                            format_results=not getattr(args, "raw", False))
+        if args.repeat > 1:
+            print(f"run {run + 1}: {time.perf_counter() - start:.3f}s", file=sys.stderr)
+
+    sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2) + b"\n")
+    return 1 if "error" in result else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ Exports BackendService which orchestrates all services.
 """
 
 from .backend_service import BackendService
+from .service_factory import get_cohere_api, get_pexels_api, get_supabase_service
 
-__all__ = ['BackendService']
+__all__ = ['BackendService', 'get_cohere_api', 'get_pexels_api', 'get_supabase_service']
 
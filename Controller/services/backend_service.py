@@ -3,17 +3,81 @@ Backend Service
 Main service class that orchestrates all external services for car search operations.
 """
 
-import hashlib
+import logging
+import re
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # Import services from their respective locations
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from Cohere import CohereAPI
+from Cohere import CohereAPI, safe_int
 from Pexels import PexelsAPI
 from Database_Model_Connection import SupabaseService
 from .models import Car, GasCar, ElectricCar
+from .metrics import SUPABASE_LATENCY, observe_latency
+from .service_factory import get_cohere_api, get_pexels_api, get_supabase_service
+
+logger = logging.getLogger(__name__)
+
+# Body type words that make a listing an ElectricCar
+_FUEL_RE = re.compile("hybrid|electric")
+
+# Generic values Cohere returns for "no preference" (built once, not per call)
+_PLACEHOLDER_VALUES = frozenset({
+    "null", "none", "n/a", "na", "any", "-", "--", "n.a.", "n.a",
+    "car", "cars", "vehicle", "vehicles", "not specified", "unspecified",
+    "no", "no preference",
+})
+
+# Color name -> hex code for the UI color swatch (read-only, built once)
+_COLOR_HEX = MappingProxyType({
+    'black': '#000000',
+    'white': '#FFFFFF',
+    'red': '#FF0000',
+    'blue': '#0000FF',
+    'green': '#008000',
+    'yellow': '#FFFF00',
+    'orange': '#FFA500',
+    'purple': '#800080',
+    'pink': '#FFC0CB',
+    'brown': '#A52A2A',
+    'beige': '#F5F5DC',
+    'gray': '#808080',
+    'grey': '#808080',
+    'silver': '#C0C0C0',
+    'gold': '#FFD700',
+    'tan': '#D2B48C',
+    'burgundy': '#800020',
+    'navy': '#000080',
+    'teal': '#008080',
+    'maroon': '#800000',
+})
+
+# Any mapped color name inside a longer description such as "metallic dark blue"
+# (longest names first, so a longer name wins over one it contains)
+_COLOR_NAME_RE = re.compile("|".join(map(re.escape, sorted(_COLOR_HEX, key=len, reverse=True))))
+
+
+@lru_cache(maxsize=512)
+def _color_hex(color_lower: str) -> str:
+    """Resolve a lowercased color name to a hex code; memoized, as colors repeat across listings."""
+    # Check for exact match first
+    hex_code = _COLOR_HEX.get(color_lower)
+    if hex_code is not None:
+        return hex_code
+    
+    # Check if color name contains any of the mapped colors (first one in the name wins)
+    match = _COLOR_NAME_RE.search(color_lower)
+    if match:
+        return _COLOR_HEX[match.group()]
+    
+    # Default to a neutral gray if no match
+    return '#808080'
 
 
 class BackendService:
@@ -32,47 +96,94 @@ class BackendService:
         Initialize BackendService with service dependencies.
         
         Args:
-            cohere_api: CohereAPI instance. If None, will create new instance.
-            supabase_service: SupabaseService instance. If None, will create new instance.
-            pexels_api: PexelsAPI instance. If None, will create new instance.
+            cohere_api: CohereAPI instance. If None, uses the process-wide shared instance.
+            supabase_service: SupabaseService instance. If None, uses the process-wide shared instance.
+            pexels_api: PexelsAPI instance. If None, uses the process-wide shared instance.
         """
-        self.cohere_api = cohere_api or CohereAPI()
-        self.supabase_service = supabase_service or SupabaseService()
-        self.pexels_api = pexels_api or PexelsAPI()
+        self.cohere_api = cohere_api or get_cohere_api()
+        self.supabase_service = supabase_service or get_supabase_service()
+        self.pexels_api = pexels_api or get_pexels_api()
+        # Shared pool for per-car image lookups (one page is at most 10 cars)
+        self._image_executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="pexels")
+        # Separate pool for batch searches, whose tasks themselves wait on the image pool
+        self._search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="search")
+        # Background next-page prefetches for filtered search (database only; images stay on demand
+        # so unviewed pages don't spend the Pexels rate limit)
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+        # In-flight AI searches by normalized query, so concurrent duplicates share one run
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
     
-    def ai_search(self, user_query: str, last_id: Optional[int] = None) -> Dict:
+    def warm_up(self) -> None:
+        """Prime the Cohere and Supabase connection pools before serving requests."""
+        self.cohere_api.warm_up()
+        self.supabase_service.warm_up()
+    
+    def ai_search(self, user_query: str, last_id: Optional[int] = None, include_images: bool = True) -> Dict:
         """
         Perform AI-powered car search using natural language query.
+        Identical searches arriving while one is in flight share its result.
         
         Args:
             user_query: Natural language description of desired car.
+            last_id: ID of the last car from previous page (for pagination)
+            include_images: If False, results come back without image URLs
+                (see iter_with_images for streaming them afterwards)
         
         Returns:
-            Dictionary with search results or error message.
+            {'results': [formatted cars], 'last_id': id of the last car or None},
+            or {'error': message} if the query is not about cars or the search failed.
         """
+        key = (" ".join(user_query.lower().split()), last_id, include_images)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._inflight[key] = Future()
+        
+        if not is_leader:
+            # Callers may mutate their cars (e.g. iter_with_images), so each gets its own copies
+            result = future.result()
+            if "results" in result:
+                return {**result, "results": [dict(car) for car in result["results"]]}
+            return result
+        
+        try:
+            result = self._run_ai_search(user_query, last_id, include_images)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _run_ai_search(self, user_query: str, last_id: Optional[int], include_images: bool) -> Dict:
+        """Run one AI search end to end (Cohere parse, database, formatting); see ai_search."""
         try:
-            # Parse query using Cohere AI
+            # Parse query using Cohere AI (the chat call itself is timed in CohereAPI)
             parsed_params = self.cohere_api.parse_car_query(user_query)
             
             # Check for errors
-            if isinstance(parsed_params, dict) and 'error' in parsed_params:
-                return parsed_params
+            if parsed_params.error:
+                return {"error": parsed_params.error}
             
             # Normalize parsed params: treat generic/placeholder values as no filter
             # so we don't filter by "any", "car", "n/a", etc. and get zero results
-            maximum_price = self._safe_int(parsed_params.get('maximumPrice'), 0) or None
-            maximum_mileage = self._safe_int(parsed_params.get('maximumMileage'), 0) or None
-            min_year = self._safe_int(parsed_params.get('minYear'), 0) or None
-            max_year = self._safe_int(parsed_params.get('maxYear'), 2026)
+            maximum_price = parsed_params.maximum_price or None
+            maximum_mileage = parsed_params.maximum_mileage or None
+            min_year = parsed_params.min_year or None
+            max_year = parsed_params.max_year
             if not max_year or max_year <= 0:
                 max_year = 2026
-            color = self._normalize_search_param(parsed_params.get('color'))
-            make = self._normalize_search_param(parsed_params.get('make'))
-            model = self._normalize_search_param(parsed_params.get('model'))
-            car_type = self._normalize_search_param(parsed_params.get('carType'))
+            color = self._normalize_search_param(parsed_params.color)
+            make = self._normalize_search_param(parsed_params.make)
+            model = self._normalize_search_param(parsed_params.model)
+            car_type = self._normalize_search_param(parsed_params.car_type)
             
             # Search database with parsed parameters
-            results = self.supabase_service.search_cars(
+            results = self._search_db(
                 maximum_price=maximum_price,
                 maximum_mileage=maximum_mileage,
                 color=color,
@@ -89,7 +200,7 @@ class BackendService:
             # If no results but we had text filters, retry with only numeric filters
             # (avoids empty results when Cohere over-specifies or DB uses different wording)
             if not results and (make or model or color or car_type):
-                results = self.supabase_service.search_cars(
+                results = self._search_db(
                     maximum_price=maximum_price,
                     maximum_mileage=maximum_mileage,
                     color=None,
@@ -104,7 +215,7 @@ class BackendService:
                 )
             
             # Format results: add images, color hex codes, filter invalid values
-            formatted_results = self.format_car_results(results)
+            formatted_results = self.format_car_results(results, include_images=include_images)
             
             # Get the last car's ID for pagination
             last_car_id = None
@@ -117,15 +228,29 @@ class BackendService:
             }
             
         except Exception as e:
-            print(f"Error in AI search: {e}")
+            logger.exception("AI search failed")
             return {"error": f"AI search failed: {str(e)}"}
     
+    def ai_search_batch(self, user_queries: List[str]) -> List[Dict]:
+        """
+        Run several AI searches concurrently, so their Cohere and Supabase
+        round-trips overlap instead of running back to back.
+        
+        Args:
+            user_queries: Natural language descriptions of desired cars.
+        
+        Returns:
+            One ai_search result dictionary per query, in the same order.
+        """
+        return list(self._search_executor.map(self.ai_search, user_queries))
+    
     def filtered_search(
         self,
         filters: Dict,
         return_has_more: bool = True,
-        last_id: Optional[int] = None
-    ) -> Tuple[List[Dict], bool, int]:
+        last_id: Optional[int] = None,
+        format_results: bool = True
+    ) -> Tuple[List[Dict], bool, int, Optional[int]]:
         """
         Perform filter-based car search.
         
@@ -140,32 +265,28 @@ class BackendService:
                 - models: List[str] (will use first item)
                 - colors: List[str] (will use first item)
             return_has_more: If True, returns tuple with has_more and total_count
+            last_id: ID of the last car from previous page (for pagination)
+            format_results: If False, return the raw database rows and skip formatting,
+                color and image lookups (for callers that only need counts or ids)
         
         Returns:
             If return_has_more is False: List of formatted car dictionaries
-            If return_has_more is True: Tuple of (formatted_results, has_more, total_count)
+            If return_has_more is True: Tuple of (formatted_results, has_more, total_count, last_car_id)
         """
         # Extract filter values
-        maximum_price = self._safe_int(filters.get('maxPrice', 0))
-        maximum_mileage = self._safe_int(filters.get('maxMileage', 0))
-        min_year = self._safe_int(filters.get('minYear', 0))
-        max_year = self._safe_int(filters.get('maxYear', 2026))
+        maximum_price = safe_int(filters.get('maxPrice', 0))
+        maximum_mileage = safe_int(filters.get('maxMileage', 0))
+        min_year = safe_int(filters.get('minYear', 0))
+        max_year = safe_int(filters.get('maxYear', 2026))
         
-        # Handle multiple values (take first one)
-        body_types = filters.get('bodyTypes', [])
-        car_type = body_types[0] if body_types else None
-        
-        makes = filters.get('makes', [])
-        make = makes[0] if makes else None
-        
-        models = filters.get('models', [])
-        model = models[0] if models else None
-        
-        colors = filters.get('colors', [])
-        color = colors[0] if colors else None
+        # Handle multiple values (take first one; missing, None or [] means no filter)
+        car_type = (filters.get('bodyTypes') or [None])[0]
+        make = (filters.get('makes') or [None])[0]
+        model = (filters.get('models') or [None])[0]
+        color = (filters.get('colors') or [None])[0]
         
         # Search database
-        results, has_more, total_count = self.supabase_service.search_cars(
+        search_kwargs = dict(
             maximum_price=maximum_price,
             maximum_mileage=maximum_mileage,
             color=color,
@@ -175,12 +296,17 @@ class BackendService:
             max_year=max_year,
             car_type=car_type,
             limit=10,
-            return_has_more=True,
-            last_id=last_id
+            return_has_more=True
         )
+        results, has_more, total_count = self._search_db(last_id=last_id, **search_kwargs)
+        
+        # Fetch the next page in the background while this one is formatted, so the
+        # "load more" request finds it in SupabaseService's search cache
+        if has_more and results and results[-1].get('id') is not None:
+            self._prefetch_executor.submit(self._prefetch_page, search_kwargs, results[-1]['id'])
         
         # Format results
-        formatted_results = self.format_car_results(results)
+        formatted_results = self.format_car_results(results) if format_results else results
         
         # Get the last car's ID for pagination
         last_car_id = None
@@ -192,6 +318,18 @@ class BackendService:
         else:
             return formatted_results
     
+    def _prefetch_page(self, search_kwargs: Dict, last_id: int) -> None:
+        """Run a search for the page after last_id only to warm the search cache."""
+        try:
+            self.supabase_service.search_cars(last_id=last_id, **search_kwargs)
+        except Exception as e:
+            logger.debug("Next page prefetch failed: %s", e)
+    
+    def _search_db(self, **kwargs):
+        """Call SupabaseService.search_cars and record its latency."""
+        with observe_latency(SUPABASE_LATENCY, "Supabase search", warn_after=1.0):
+            return self.supabase_service.search_cars(**kwargs)
+    
     def _create_car_from_dict(self, car_dict: Dict) -> Car:
         """
         Factory method to create appropriate Car object from dictionary.
@@ -210,16 +348,31 @@ class BackendService:
         body_type = car_dict.get("body_type") or car_dict.get("bodyType") or car_dict.get("carType") or ""
         body_type_lower = str(body_type).lower()
         
-        # Determine if car is electric/hybrid based on body_type
-        is_electric = "hybrid" in body_type_lower or "electric" in body_type_lower
+        # Determine if car is electric/hybrid: from the generated fuel_type column when the
+        # table has it, otherwise from body_type in one scan. The result is handed to
+        # ElectricCar so get_fuel_type doesn't scan again.
+        fuel_type = car_dict.get("fuel_type")
+        if fuel_type in ("Gas", "Electric", "Hybrid"):
+            is_electric = fuel_type != "Gas"
+            is_hybrid = fuel_type == "Hybrid"
+        else:
+            fuel_match = _FUEL_RE.search(body_type_lower)
+            is_electric = fuel_match is not None
+            # "hybrid" anywhere wins; after an "electric" match only the rest needs checking
+            is_hybrid = is_electric and (
+                fuel_match.group() == "hybrid" or "hybrid" in body_type_lower[fuel_match.end():]
+            )
         
-        # Extract common attributes
+        # Extract common attributes (each key read once)
+        year = car_dict.get("year")
+        price = car_dict.get("price")
+        mileage = car_dict.get("mileage")
         car_data = {
             "make": car_dict.get("make", "Unknown"),
             "model": car_dict.get("model", "Unknown"),
-            "year": int(car_dict.get("year", 0)) if car_dict.get("year") else 0,
-            "price": float(car_dict.get("price", 0)) if car_dict.get("price") else 0.0,
-            "mileage": int(car_dict.get("mileage", 0)) if car_dict.get("mileage") else 0,
+            "year": int(year) if year else 0,
+            "price": float(price) if price else 0.0,
+            "mileage": int(mileage) if mileage else 0,
             "body_type": body_type or "Unknown",
             "color": car_dict.get("color", "Unknown"),
             "url": car_dict.get("url") or car_dict.get("listing_url")
@@ -228,11 +381,11 @@ class BackendService:
         # Create appropriate car type
         if is_electric:
             battery_range = car_dict.get("battery_range") or car_dict.get("batteryRange")
-            return ElectricCar(battery_range=battery_range, **car_data)
+            return ElectricCar(battery_range=battery_range, is_hybrid=is_hybrid, **car_data)
         else:
             return GasCar(**car_data)
     
-    def format_car_results(self, cars: List[Dict]) -> List[Dict]:
+    def format_car_results(self, cars: List[Dict], include_images: bool = True) -> List[Dict]:
         """
         Format car results by:
         1. Creating Car objects (GasCar or ElectricCar) from dictionaries
@@ -245,6 +398,7 @@ class BackendService:
         
         Args:
             cars: List of car dictionaries from database
+            include_images: If False, skip step 4 (image lookups)
         
         Returns:
             List of formatted car dictionaries with fuelType from polymorphism
@@ -252,73 +406,123 @@ class BackendService:
         if not cars:
             return []
         
-        print(f"Formatting {len(cars)} car(s) - creating Car objects with polymorphic fuel types")
+        logger.debug("Formatting %d car(s) - creating Car objects with polymorphic fuel types", len(cars))
         
-        formatted_cars = []
-        for car in cars:
-            if not isinstance(car, dict):
-                continue
+        format_car = self._format_car
+        formatted_cars = [format_car(car) for car in cars if isinstance(car, dict)]
+        
+        if include_images:
+            self.attach_images(formatted_cars)
+        return formatted_cars
+    
+    def _format_car(self, car: Dict) -> Dict:
+        """
+        Format one database row (steps 1-3 of format_car_results).
+        
+        Args:
+            car: Car dictionary from database
+        
+        Returns:
+            Formatted car dictionary; the row itself plus colorHex if it cannot be modeled
+        """
+        try:
+            # Create Car object (GasCar or ElectricCar) using factory, then convert to dict -
+            # uses polymorphic get_fuel_type() (Gas vs Electric/Hybrid)
+            formatted_car = self._create_car_from_dict(car).to_dict()
             
-            try:
-                # Create Car object (GasCar or ElectricCar) using factory
-                car_obj = self._create_car_from_dict(car)
-                
-                # Convert to dict - uses polymorphic get_fuel_type() (Gas vs Electric/Hybrid)
-                formatted_car = car_obj.to_dict()
-                
-                # Preserve ID from original car dictionary for pagination
-                if 'id' in car:
-                    formatted_car['id'] = car['id']
-                
-                # Add color hex code for visualization
-                if formatted_car.get('color'):
-                    formatted_car['colorHex'] = self.get_color_hex(formatted_car['color'])
-                else:
-                    formatted_car['colorHex'] = None
-                
-                # Fetch and add car image URL
-                make = formatted_car.get('make', '')
-                model = formatted_car.get('model', '')
-                year = formatted_car.get('year')
-                color = formatted_car.get('color')
-                
-                if make and model:
-                    image_url = self.pexels_api.get_car_image_url(make, model, year, color)
-                    formatted_car['imageUrl'] = image_url
-                    formatted_car['image'] = image_url
-                else:
-                    fallback_url = self.pexels_api.get_fallback_image(
-                        make or "car", 
-                        model or "vehicle", 
-                        year
-                    )
-                    formatted_car['imageUrl'] = fallback_url
-                    formatted_car['image'] = fallback_url
-                
-                formatted_cars.append(formatted_car)
-                
-            except Exception as e:
-                print(f"Error creating Car object for {car.get('make', 'Unknown')} {car.get('model', 'Unknown')}: {e}")
-                # Fallback: use original dict
-                formatted_car = car.copy()
-                formatted_car['colorHex'] = self.get_color_hex(formatted_car.get('color'))
-                
-                # Still add image URL
-                make = formatted_car.get('make', '')
-                model = formatted_car.get('model', '')
-                year = formatted_car.get('year')
-                color = formatted_car.get('color')
-                if make and model:
-                    formatted_car['imageUrl'] = self.pexels_api.get_car_image_url(make, model, year, color)
-                    formatted_car['image'] = formatted_car['imageUrl']
-                else:
-                    fallback_url = self.pexels_api.get_fallback_image(make or "car", model or "vehicle", year)
-                    formatted_car['imageUrl'] = fallback_url
-                    formatted_car['image'] = fallback_url
-                formatted_cars.append(formatted_car)
+            # Preserve ID from original car dictionary for pagination
+            if 'id' in car:
+                formatted_car['id'] = car['id']
+        except Exception as e:
+            logger.warning("Error creating Car object for %s %s: %s", car.get('make', 'Unknown'), car.get('model', 'Unknown'), e)
+            # Fallback: use original dict
+            formatted_car = car.copy()
+        
+        # Add color hex code for visualization (None when there is no color)
+        formatted_car['colorHex'] = self.get_color_hex(formatted_car.get('color'))
+        return formatted_car
+    
+    def iter_format_car_results(self, cars: List[Dict], batch_size: int = 10) -> Iterator[Dict]:
+        """
+        Format cars in batches and yield them in order, so callers can start
+        sending results before every image lookup has finished.
+        
+        Args:
+            cars: List of car dictionaries from database
+            batch_size: Cars formatted (and image-looked-up) together
+        
+        Yields:
+            Formatted car dictionaries, as format_car_results returns them
+        """
+        for start in range(0, len(cars), batch_size):
+            yield from self.format_car_results(cars[start:start + batch_size])
+    
+    def attach_images(self, formatted_cars: List[Dict], parallel: bool = True) -> List[Dict]:
+        """
+        Set imageUrl/image on formatted cars (Pexels search or fallback).
+        
+        Args:
+            formatted_cars: Formatted car dictionaries (updated in place)
+            parallel: Run Pexels searches on the image executor. Must be False
+                when already running on that executor, to avoid waiting on itself.
+        
+        Returns:
+            The same list, for chaining
+        """
+        # Cached URLs come back from one Redis MGET; only misses go to Pexels, concurrently
+        image_urls = [None] * len(formatted_cars)
+        lookup_indexes, lookups = [], []
+        for index, formatted_car in enumerate(formatted_cars):
+            make = formatted_car.get('make', '')
+            model = formatted_car.get('model', '')
+            year = formatted_car.get('year')
+            if make and model:
+                lookup_indexes.append(index)
+                lookups.append((make, model, year, formatted_car.get('color')))
+            else:
+                image_urls[index] = self.pexels_api.get_fallback_image(make or "car", model or "vehicle", year)
+        
+        executor = self._image_executor if parallel else None
+        found_urls = self.pexels_api.get_car_image_urls(lookups, executor=executor)
+        for index, image_url in zip(lookup_indexes, found_urls):
+            image_urls[index] = image_url
+        
+        for formatted_car, image_url in zip(formatted_cars, image_urls):
+            formatted_car['imageUrl'] = image_url
+            formatted_car['image'] = image_url
         
         return formatted_cars
     
+    def iter_with_images(self, formatted_cars: List[Dict]) -> Iterator[Dict]:
+        """
+        Attach image URLs and yield each car as soon as its image is resolved.
+        Cars sharing a make/model are looked up together, so they arrive together.
+        
+        Args:
+            formatted_cars: Formatted car dictionaries without images
+        
+        Yields:
+            Formatted car dictionaries with imageUrl/image set, in completion order
+        """
+        groups: Dict[Tuple[str, str], List[Dict]] = {}
+        for formatted_car in formatted_cars:
+            key = (str(formatted_car.get('make') or '').lower(), str(formatted_car.get('model') or '').lower())
+            groups.setdefault(key, []).append(formatted_car)
+        
+        futures = {self._image_executor.submit(self.attach_images, cars, False): cars for cars in groups.values()}
+        for future in as_completed(futures):
+            try:
+                yield from future.result()
+            except Exception as e:
+                logger.warning("Error fetching images: %s", e)
+                for formatted_car in futures[future]:
+                    fallback = self.pexels_api.get_fallback_image(
+                        formatted_car.get('make') or "car", formatted_car.get('model') or "vehicle", formatted_car.get('year')
+                    )
+                    formatted_car['imageUrl'] = fallback
+                    formatted_car['image'] = fallback
+                    yield formatted_car
+    
     def get_color_hex(self, color_name: str) -> Optional[str]:
         """
         Map color name to hex code for visualization.
@@ -331,49 +535,7 @@ class BackendService:
         """
         if not color_name:
             return None
-        
-        color_map = {
-            'black': '#000000',
-            'white': '#FFFFFF',
-            'red': '#FF0000',
-            'blue': '#0000FF',
-            'green': '#008000',
-            'yellow': '#FFFF00',
-            'orange': '#FFA500',
-            'purple': '#800080',
-            'pink': '#FFC0CB',
-            'brown': '#A52A2A',
-            'beige': '#F5F5DC',
-            'gray': '#808080',
-            'grey': '#808080',
-            'silver': '#C0C0C0',
-            'gold': '#FFD700',
-            'tan': '#D2B48C',
-            'burgundy': '#800020',
-            'navy': '#000080',
-            'teal': '#008080',
-            'maroon': '#800000',
-        }
-        
-        color_lower = str(color_name).lower().strip()
-        # Check for exact match first
-        if color_lower in color_map:
-            return color_map[color_lower]
-        
-        # Check if color name contains any of the mapped colors
-        for mapped_color, hex_code in color_map.items():
-            if mapped_color in color_lower:
-                return hex_code
-        
-        # Default to a neutral gray if no match
-        return '#808080'
-    
-    def _safe_int(self, value, default=0) -> int:
-        """Safely convert value to integer."""
-        try:
-            return int(float(str(value).replace(",", "")))
-        except:
-            return default
+        return _color_hex(str(color_name).lower().strip())
     
     def _normalize_search_param(self, value: Optional[str]) -> Optional[str]:
         """
@@ -383,13 +545,7 @@ class BackendService:
         if value is None:
             return None
         s = str(value).strip().lower()
-        if not s:
-            return None
-        placeholders = {
-            "null", "none", "n/a", "na", "any", "-", "--", "n.a.", "n.a",
-            "car", "cars", "vehicle", "vehicles", "not specified", "unspecified",
-        }
-        if s in placeholders or s in ("no", "no preference"):
+        if not s or s in _PLACEHOLDER_VALUES:
             return None
         return value.strip() if value else None
 
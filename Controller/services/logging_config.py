@@ -0,0 +1,39 @@
+"""
+Logging configuration for the API server.
+Request threads only enqueue log records; a background QueueListener thread formats
+and writes them, so a burst of errors never blocks a request on stdout.
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    Route root logger output through a queue drained by a background thread.
+    Safe to call more than once; only the first call installs handlers.
+
+    Args:
+        level: Log level name (e.g. "INFO"). If None, uses LOG_LEVEL (default INFO).
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
@@ -0,0 +1,87 @@
+"""
+Latency Metrics
+Prometheus histograms around Cohere, Supabase, and API handler calls.
+Falls back to no-op timers when prometheus-client is not installed.
+When PROMETHEUS_MULTIPROC_DIR is set (gunicorn.conf.py sets it), every worker
+writes its samples there and /metrics reports the sum over all workers.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Histogram, generate_latest, multiprocess
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+
+class _NoopHistogram:
+    """Stand-in used when prometheus-client is missing."""
+
+    def labels(self, *args, **kwargs) -> "_NoopHistogram":
+        return self
+
+    def observe(self, value: float) -> None:
+        pass
+
+
+if PROMETHEUS_AVAILABLE:
+    COHERE_LATENCY = Histogram(
+        "cohere_chat_seconds",
+        "Cohere chat call latency (cache hits excluded)",
+        buckets=(0.1, 0.2, 0.4, 0.8, 1.6, 3.2),
+    )
+    SUPABASE_LATENCY = Histogram(
+        "supabase_query_seconds",
+        "Supabase search query latency",
+        buckets=(0.025, 0.05, 0.1, 0.2, 0.4, 0.8, 1.6),
+    )
+    REQUEST_LATENCY = Histogram(
+        "api_request_seconds",
+        "API handler latency",
+        ["endpoint"],
+        buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0),
+    )
+else:
+    COHERE_LATENCY = _NoopHistogram()
+    SUPABASE_LATENCY = _NoopHistogram()
+    REQUEST_LATENCY = _NoopHistogram()
+
+
+@contextmanager
+def observe_latency(histogram, label: str, warn_after: Optional[float] = None) -> Iterator[None]:
+    """
+    Time the wrapped block and record it on histogram.
+
+    Args:
+        histogram: Histogram (or labelled child) to observe into.
+        label: Name used in the slow-call warning.
+        warn_after: Log a warning when the block takes longer than this many seconds.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        histogram.observe(elapsed)
+        if warn_after is not None and elapsed > warn_after:
+            logger.warning("Slow %s: %.2fs", label, elapsed)
+
+
+def render_metrics() -> bytes:
+    """Return the Prometheus text exposition of all registered metrics."""
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus-client not installed\n"
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Aggregate the files written by every worker, not just the one serving this request
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
@@ -13,6 +13,9 @@ class Car(ABC):
     Defines common interface for all car types.
     """
     
+    # Fixed attribute set: no per-instance __dict__ for the ~10 cars built per response
+    __slots__ = ("make", "model", "year", "price", "mileage", "body_type", "color", "url")
+    
     def __init__(
         self,
         make: str,
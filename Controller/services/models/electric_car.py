@@ -13,24 +13,29 @@ class ElectricCar(Car):
     Used for electric and hybrid vehicles.
     """
     
-    def __init__(self, *args, battery_range: Optional[int] = None, **kwargs):
+    __slots__ = ("battery_range", "_is_hybrid")
+    
+    def __init__(self, *args, battery_range: Optional[int] = None, is_hybrid: Optional[bool] = None, **kwargs):
         """
         Initialize ElectricCar with optional battery range.
         
         Args:
             *args: Arguments passed to parent Car class
             battery_range: Battery range in miles (optional)
+            is_hybrid: Whether body_type marks a hybrid, if the caller already checked (optional)
             **kwargs: Keyword arguments passed to parent Car class
         """
         super().__init__(*args, **kwargs)
         self.battery_range = battery_range
+        self._is_hybrid = is_hybrid
     
     def get_fuel_type(self) -> str:
         """
         Return fuel type as 'Electric' or 'Hybrid'.
         Polymorphic method - ElectricCar returns 'Hybrid' if body_type contains 'hybrid', else 'Electric'.
         """
-        if "hybrid" in self.body_type.lower():
-            return "Hybrid"
-        return "Electric"
+        is_hybrid = self._is_hybrid
+        if is_hybrid is None:
+            is_hybrid = "hybrid" in self.body_type.lower()
+        return "Hybrid" if is_hybrid else "Electric"
 
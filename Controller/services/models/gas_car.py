@@ -13,6 +13,8 @@ class GasCar(Car):
     Used for cars that run on gasoline/petrol.
     """
     
+    __slots__ = ()
+    
     def get_fuel_type(self) -> str:
         """
         Return fuel type as 'Gas'.
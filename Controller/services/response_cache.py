@@ -0,0 +1,183 @@
+"""
+Response Cache
+LRU cache of serialized API response bodies with a TTL.
+Repeated searches are answered without re-running the backend or re-serializing.
+When REDIS_URL is set, entries are also shared across gunicorn workers through Redis,
+and a data version (bumped after each listings upload) invalidates them all at once.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple
+import orjson
+
+# Try to import redis for the cross-worker tier
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Redis counter bumped by bump_data_version() after listings are reloaded
+DATA_VERSION_KEY = "listings:data_version"
+
+
+def bump_data_version(redis_url: Optional[str] = None) -> bool:
+    """
+    Mark listings data as changed, invalidating cached responses and ETags in every API worker.
+
+    Args:
+        redis_url: Redis URL. If None, uses REDIS_URL.
+
+    Returns:
+        True if the version was bumped, False without Redis or on failure.
+    """
+    if redis_url is None:
+        redis_url = os.getenv("REDIS_URL")
+    if not redis_url or not REDIS_AVAILABLE:
+        return False
+    try:
+        redis.Redis.from_url(redis_url, socket_timeout=2, socket_connect_timeout=2).incr(DATA_VERSION_KEY)
+        return True
+    except Exception as e:
+        logger.warning("Redis data version bump failed: %s", e)
+        return False
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache mapping a request key to (JSON body bytes, prefetch URLs),
+    optionally backed by Redis.
+    """
+
+    REDIS_KEY_PREFIX = "resp:v1:"
+    
+    # Re-read the shared data version at most this often
+    VERSION_REFRESH_SECONDS = 5
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 300, redis_url: Optional[str] = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Entries kept in process before the least recently used one is evicted.
+            ttl_seconds: Seconds an entry stays valid (in process and in Redis).
+            redis_url: Redis URL for the shared tier. If None, uses REDIS_URL (optional).
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._data_version: Optional[str] = None
+        self._data_version_read_at = 0.0
+
+        if redis_url is None:
+            redis_url = os.getenv("REDIS_URL")
+        self.redis = None
+        if redis_url and REDIS_AVAILABLE:
+            self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def data_version(self) -> Optional[str]:
+        """
+        Return the listings data version shared through Redis, refreshed at most
+        every VERSION_REFRESH_SECONDS.
+
+        Returns:
+            Version string ("0" before the first upload), or None without Redis.
+        """
+        if self.redis is None:
+            return None
+        now = time.monotonic()
+        if self._data_version is None or now - self._data_version_read_at > self.VERSION_REFRESH_SECONDS:
+            try:
+                value = self.redis.get(DATA_VERSION_KEY)
+                self._data_version = value.decode() if value is not None else "0"
+            except Exception as e:
+                logger.warning("Redis data version read failed: %s", e)
+            self._data_version_read_at = now
+        return self._data_version
+
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, List[str]]]:
+        """
+        Return the cached (body, prefetch_urls) for key, or None if missing or expired.
+
+        Args:
+            key: Request key (endpoint plus normalized inputs).
+
+        Returns:
+            Tuple of (body, prefetch_urls) or None.
+        """
+        key = (self.data_version(), key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, body, prefetch_urls = entry
+                if time.monotonic() - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    return body, prefetch_urls
+                del self._entries[key]
+
+        shared = self._redis_get(key)
+        if shared is not None:
+            self._put_local(key, *shared)
+        return shared
+
+    def put(self, key: Hashable, body: bytes, prefetch_urls: List[str]) -> None:
+        """
+        Store a serialized response body, evicting the least recently used entry when full.
+
+        Args:
+            key: Request key (endpoint plus normalized inputs).
+            body: Serialized JSON response body.
+            prefetch_urls: Image URLs sent as Link prefetch headers with the body.
+        """
+        key = (self.data_version(), key)
+        self._put_local(key, body, prefetch_urls)
+        self._redis_set(key, body, prefetch_urls)
+
+    def _put_local(self, key: Hashable, body: bytes, prefetch_urls: List[str]) -> None:
+        """Store an entry in the in-process LRU."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), body, prefetch_urls)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _redis_key(self, key: Hashable) -> str:
+        """Hash a request key into a fixed-length Redis key."""
+        return self.REDIS_KEY_PREFIX + hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+
+    def _redis_get(self, key: Hashable) -> Optional[Tuple[bytes, List[str]]]:
+        """
+        Read a response stored by any worker from Redis.
+
+        Returns:
+            Tuple of (body, prefetch_urls), or None if absent/unavailable.
+        """
+        if self.redis is None:
+            return None
+        try:
+            value = self.redis.get(self._redis_key(key))
+        except Exception as e:
+            logger.warning("Redis response cache read failed: %s", e)
+            return None
+        if value is None:
+            return None
+        # Stored as <prefetch URLs JSON>\n<body>; orjson never emits a raw newline
+        urls, body = value.split(b"\n", 1)
+        return body, orjson.loads(urls)
+
+    def _redis_set(self, key: Hashable, body: bytes, prefetch_urls: List[str]) -> None:
+        """Write a response to Redis with ttl_seconds; failures are ignored."""
+        if self.redis is None:
+            return
+        try:
+            self.redis.setex(self._redis_key(key), self.ttl_seconds, orjson.dumps(prefetch_urls) + b"\n" + body)
+        except Exception as e:
+            logger.warning("Redis response cache write failed: %s", e)
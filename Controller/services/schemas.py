@@ -20,6 +20,12 @@ class SearchRequest(BaseModel):
     last_id: Optional[int] = Field(None, ge=1, description="Cursor for pagination (id of last car from previous page)")
 
 
+class BatchSearchRequest(BaseModel):
+    """Request body for POST /api/search/batch (several AI-powered searches)."""
+
+    queries: list[str] = Field(..., min_length=1, max_length=10, description="Natural language search descriptions")
+
+
 class FilterSchema(BaseModel):
     """Filter criteria for car search. All fields optional."""
 
@@ -70,9 +76,22 @@ class SearchResponse(BaseModel):
     count: int = Field(..., ge=0, description="Number of cars returned")
     query: Optional[str] = Field(None, description="Original query (AI search only)")
     hasMore: bool = Field(False, description="Whether more results exist")
-    totalCount: Optional[int] = Field(None, ge=0, description="Total matching count (filtered search)")
+    totalCount: Optional[int] = Field(None, ge=0, description="Estimated total matching count (filtered search)")
     last_id: Optional[int] = Field(None, description="Cursor for next page")
     message: Optional[str] = Field(None, description="Optional hint message")
+    prefetchUrls: list[str] = Field(default_factory=list, description="Image URLs the client can prefetch")
+
+
+class BatchSearchResult(SearchResponse):
+    """One query's result inside BatchSearchResponse."""
+
+    error: Optional[str] = Field(None, description="Set instead of cars when this query failed")
+
+
+class BatchSearchResponse(BaseModel):
+    """Response for POST /api/search/batch."""
+
+    results: list[BatchSearchResult] = Field(..., description="One result per query, in request order")
 
 
 class CarsListResponse(BaseModel):
@@ -80,6 +99,7 @@ class CarsListResponse(BaseModel):
 
     cars: list[CarResponse] = Field(..., description="List of cars")
     count: int = Field(..., ge=0, description="Number of cars returned")
+    prefetchUrls: list[str] = Field(default_factory=list, description="Image URLs the client can prefetch")
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,35 @@
+"""
+Service Factory
+Memoized constructors for the external service clients.
+Each process builds one CohereAPI, SupabaseService and PexelsAPI and reuses it,
+so their connection pools and caches are shared by everything in that process.
+"""
+
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+# Import services from their respective locations
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from Cohere import CohereAPI
+from Pexels import PexelsAPI
+from Database_Model_Connection import SupabaseService
+from .metrics import COHERE_LATENCY
+
+
+@lru_cache(maxsize=1)
+def get_cohere_api() -> CohereAPI:
+    """Return this process's shared CohereAPI client."""
+    return CohereAPI(chat_latency=COHERE_LATENCY)
+
+
+@lru_cache(maxsize=1)
+def get_supabase_service() -> SupabaseService:
+    """Return this process's shared SupabaseService client."""
+    return SupabaseService()
+
+
+@lru_cache(maxsize=1)
+def get_pexels_api() -> PexelsAPI:
+    """Return this process's shared PexelsAPI client."""
+    return PexelsAPI()
@@ -0,0 +1,66 @@
+-- Indexes for SupabaseService.search_cars on "CarListings".
+-- Run once in the Supabase SQL editor (safe to re-run).
+
+-- Trigram GIN indexes let the ilike '%value%' text filters use an index
+-- instead of a sequential scan (pg_trgm supports ILIKE directly).
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS carlistings_make_trgm_idx
+    ON "CarListings" USING gin (make gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS carlistings_model_trgm_idx
+    ON "CarListings" USING gin (model gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS carlistings_color_trgm_idx
+    ON "CarListings" USING gin (color gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS carlistings_body_type_trgm_idx
+    ON "CarListings" USING gin (body_type gin_trgm_ops);
+
+-- Numeric range filters (price <= x, mileage <= y, year between a and b)
+CREATE INDEX IF NOT EXISTS carlistings_price_mileage_year_idx
+    ON "CarListings" (price, mileage, year);
+
+-- The composite above only serves searches that filter on price (its leading
+-- column); mileage-only and year-only range filters need their own B-trees.
+-- BRIN is not used: uploads insert rows in random order, so no column
+-- correlates with physical position.
+CREATE INDEX IF NOT EXISTS carlistings_mileage_idx
+    ON "CarListings" (mileage);
+CREATE INDEX IF NOT EXISTS carlistings_year_idx
+    ON "CarListings" (year);
+
+-- Lowercased copies of the text filter columns, computed once at write time.
+-- SupabaseService.search_cars detects them and switches from ilike to a plain
+-- LIKE on these (filter values are lowercased in Python), skipping per-row lower().
+ALTER TABLE "CarListings" ADD COLUMN IF NOT EXISTS make_lc text GENERATED ALWAYS AS (lower(make)) STORED;
+ALTER TABLE "CarListings" ADD COLUMN IF NOT EXISTS model_lc text GENERATED ALWAYS AS (lower(model)) STORED;
+ALTER TABLE "CarListings" ADD COLUMN IF NOT EXISTS color_lc text GENERATED ALWAYS AS (lower(color)) STORED;
+
+CREATE INDEX IF NOT EXISTS carlistings_make_lc_trgm_idx
+    ON "CarListings" USING gin (make_lc gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS carlistings_model_lc_trgm_idx
+    ON "CarListings" USING gin (model_lc gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS carlistings_color_lc_trgm_idx
+    ON "CarListings" USING gin (color_lc gin_trgm_ops);
+
+-- make/model filters are prefix matches (LIKE 'value%'); text_pattern_ops
+-- B-trees answer those with an index range seek
+CREATE INDEX IF NOT EXISTS carlistings_make_lc_prefix_idx
+    ON "CarListings" (make_lc text_pattern_ops);
+CREATE INDEX IF NOT EXISTS carlistings_model_lc_prefix_idx
+    ON "CarListings" (model_lc text_pattern_ops);
+
+-- Fuel type derived from body_type once at write time, with the same rules as
+-- BackendService._create_car_from_dict ("hybrid" anywhere wins, then "electric").
+-- SupabaseService selects it when present, so rows arrive pre-classified.
+ALTER TABLE "CarListings" ADD COLUMN IF NOT EXISTS fuel_type text GENERATED ALWAYS AS (
+    CASE
+        WHEN lower(body_type) LIKE '%hybrid%' THEN 'Hybrid'
+        WHEN lower(body_type) LIKE '%electric%' THEN 'Electric'
+        ELSE 'Gas'
+    END
+) STORED;
+CREATE INDEX IF NOT EXISTS carlistings_fuel_type_idx
+    ON "CarListings" (fuel_type);
+
+-- Refresh planner statistics so the new indexes are picked up and the
+-- count='planned' row estimate behind totalCount stays close (re-run after bulk uploads)
+ANALYZE "CarListings";
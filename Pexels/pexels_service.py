@@ -3,10 +3,49 @@ Pexels API Service
 Abstraction layer for fetching car images from Pexels API.
 """
 
+import logging
 import os
+import re
+import threading
+import time
 import requests
-import hashlib
-from typing import Optional
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Try to import redis for the persistent, cross-worker image URL cache
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Photo alt/url substrings that mean "not a car photo" (motorcycles, people, fashion models)
+_EXCLUDE_KEYWORDS_RE = re.compile(
+    "motorcycle|bike|bicycle|scooter|model|person|people|portrait|fashion|woman|man|girl|boy"
+)
+
+# Alt-text substrings that mark a photo as a car ("sports car", "luxury car" are covered by "car")
+_CAR_KEYWORDS_RE = re.compile("car|automobile|vehicle|sedan|suv|coupe|convertible|hatchback")
+
+# Generic car photos used when Pexels has no match (or no API key is configured)
+_FALLBACK_IMAGES = (
+    "https://images.pexels.com/photos/170811/pexels-photo-170811.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
+    "https://images.pexels.com/photos/116675/pexels-photo-116675.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
+    "https://images.pexels.com/photos/1592384/pexels-photo-1592384.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
+    "https://images.pexels.com/photos/1149137/pexels-photo-1149137.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
+    "https://images.pexels.com/photos/164634/pexels-photo-164634.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
+    "https://images.pexels.com/photos/3802508/pexels-photo-3802508.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
+    "https://images.pexels.com/photos/1545743/pexels-photo-1545743.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
+    "https://images.pexels.com/photos/1719647/pexels-photo-1719647.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
+    "https://images.pexels.com/photos/358070/pexels-photo-358070.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
+    "https://images.pexels.com/photos/210019/pexels-photo-210019.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
+)
 
 
 class PexelsAPI:
@@ -15,18 +54,65 @@ class PexelsAPI:
     Provides methods for searching and retrieving car images.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Image URL cache: repeat (make, model, year, color) lookups skip the Pexels call
+    IMAGE_CACHE_MAX_ENTRIES = 4096
+    IMAGE_CACHE_TTL_SECONDS = 86400
+    # Misses are remembered briefly, so a car with no Pexels match does not repeat the
+    # search on every page even without Redis
+    IMAGE_CACHE_MISS_TTL_SECONDS = 600
+    
+    # Persistent (Redis) cache lifetimes; cars with no Pexels match are cached for a day to spare the hourly rate limit
+    REDIS_HIT_TTL_SECONDS = 30 * 86400
+    REDIS_MISS_TTL_SECONDS = 86400
+    
+    # Failed searches (timeout, 429, 5xx) are retried after this long, both in process and in Redis
+    SEARCH_ERROR_TTL_SECONDS = 120
+    
+    def __init__(self, api_key: Optional[str] = None, redis_url: Optional[str] = None):
         """
         Initialize Pexels API client.
         
         Args:
             api_key: Pexels API key. If None, will try to get from environment.
+            redis_url: Redis URL for the persistent image cache. If None, uses REDIS_URL;
+                the cache is disabled when neither is set or redis is not installed.
         """
         if api_key is None:
             api_key = os.getenv("PEXELS_API_KEY")
         
         self.api_key = api_key
         self.base_url = "https://api.pexels.com/v1/search"
+        
+        # Keep-alive pool shared by the concurrent image lookups in format_car_results
+        self.session = requests.Session()
+        # Retry dropped connections and transient gateway errors, but not read timeouts
+        # (each would add the full 3s timeout) or 429s (retrying burns rate limit)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=2,
+                read=0,
+                backoff_factor=0.1,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET"}),
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        if api_key:
+            self.session.headers.update({"Authorization": api_key})
+        
+        self._image_cache: "OrderedDict[tuple, Tuple[float, str]]" = OrderedDict()
+        self._image_cache_lock = threading.Lock()
+        self._image_cache_hits = 0
+        self._image_cache_misses = 0
+        
+        if redis_url is None:
+            redis_url = os.getenv("REDIS_URL")
+        self.redis = None
+        if redis_url and REDIS_AVAILABLE:
+            self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
     
     def get_car_image_url(
         self, 
@@ -47,7 +133,28 @@ class PexelsAPI:
         Returns:
             Image URL string (either from Pexels or fallback).
         """
-        try:
+        return self.get_car_image_urls([(make, model, year, color)])[0]
+    
+    def get_car_image_urls(
+        self, 
+        lookups: List[Tuple[str, str, Optional[int], Optional[str]]], 
+        executor: Optional[Executor] = None
+    ) -> List[str]:
+        """
+        Fetch image URLs for several cars, reading Redis with one MGET and
+        writing new results back with one pipeline.
+        
+        Args:
+            lookups: (make, model, year, color) tuples, one per car.
+            executor: Optional executor used to run Pexels searches concurrently.
+        
+        Returns:
+            Image URL strings in the same order as lookups (Pexels or fallback).
+        """
+        results: List[Optional[str]] = [None] * len(lookups)
+        pending = []  # (index, make, model, year, color, cache_key) missing from memory
+        
+        for index, (make, model, year, color) in enumerate(lookups):
             # Clean and validate inputs
             make = str(make).strip() if make else ""
             model = str(model).strip() if model else ""
@@ -56,63 +163,176 @@ class PexelsAPI:
             
             # Skip if essential info is missing
             if not make or not model:
-                print(f"Skipping image search - missing make or model: make={make}, model={model}")
-                return self.get_fallback_image(make, model, year)
-            
-            # Try Pexels API if key is available
-            if self.api_key:
-                image_url = self._search_pexels(make, model, year, color)
-                if image_url:
-                    return image_url
+                logger.debug("Skipping image search - missing make or model: make=%s, model=%s", make, model)
+                results[index] = self.get_fallback_image(make, model, year)
+                continue
             
-            # Fallback to generic car images
-            return self.get_fallback_image(make, model, year)
+            if not self.api_key:
+                results[index] = self.get_fallback_image(make, model, year)
+                continue
             
+            cache_key = (make.lower(), model.lower(), year, color)
+            with self._image_cache_lock:
+                entry = self._image_cache.get(cache_key)
+                if entry is not None:
+                    expires_at, image_url = entry
+                    if time.monotonic() < expires_at:
+                        self._image_cache.move_to_end(cache_key)
+                        self._image_cache_hits += 1
+                        # "" marks a recent miss
+                        results[index] = image_url or self.get_fallback_image(make, model, year)
+                        continue
+                    del self._image_cache[cache_key]
+                self._image_cache_misses += 1
+            pending.append((index, make, model, year, color, cache_key))
+        
+        if not pending:
+            return results
+        
+        # Persistent cache, one round-trip: "" marks a recent miss, so skip Pexels and use the fallback
+        to_search = []
+        cached_urls = self._redis_mget([self._redis_key(*item[5]) for item in pending])
+        for item, image_url in zip(pending, cached_urls):
+            index, make, model, year, color, cache_key = item
+            if image_url:
+                self._remember_image(cache_key, image_url)
+                results[index] = image_url
+            elif image_url == "":
+                self._remember_image(cache_key, "")
+                results[index] = self.get_fallback_image(make, model, year)
+            else:
+                to_search.append(item)
+        
+        if not to_search:
+            return results
+        
+        # One Pexels query per distinct make/model; cars in a group pick different photos from it
+        groups: Dict[Tuple[str, str], list] = {}
+        for item in to_search:
+            groups.setdefault((item[1].lower(), item[2].lower()), []).append(item)
+        group_items = list(groups.values())
+        if executor is not None:
+            photo_lists = list(executor.map(lambda items: self._search_car_photos(items[0][1], items[0][2]), group_items))
+        else:
+            photo_lists = [self._search_car_photos(items[0][1], items[0][2]) for items in group_items]
+        
+        found_urls = {}  # index -> URL, "" if Pexels has no match, None if the search failed or the photo was unusable
+        for items, photos in zip(group_items, photo_lists):
+            for index, make, model, year, color, _ in items:
+                if photos is None:
+                    found_urls[index] = None
+                else:
+                    found_urls[index] = self._pick_photo(photos, make, model, year, color) if photos else ""
+        
+        writes = []  # (redis_key, value, ttl_seconds)
+        for index, make, model, year, color, cache_key in to_search:
+            image_url = found_urls[index]
+            redis_key = self._redis_key(*cache_key)
+            if image_url:
+                self._remember_image(cache_key, image_url)
+                writes.append((redis_key, image_url, self.REDIS_HIT_TTL_SECONDS))
+                results[index] = image_url
+            elif image_url == "":
+                self._remember_image(cache_key, "")
+                writes.append((redis_key, "", self.REDIS_MISS_TTL_SECONDS))
+                results[index] = self.get_fallback_image(make, model, year)
+            else:
+                # Timeouts/rate limits are not a real miss: cache them only briefly so they are retried
+                self._remember_image(cache_key, "", self.SEARCH_ERROR_TTL_SECONDS)
+                writes.append((redis_key, "", self.SEARCH_ERROR_TTL_SECONDS))
+                results[index] = self.get_fallback_image(make, model, year)
+        self._redis_set_many(writes)
+        
+        return results
+    
+    def _remember_image(self, cache_key: tuple, image_url: str, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store an image URL ("" for a miss) in the in-process LRU with its TTL,
+        evicting the least recently used entry when full.
+        ttl_seconds overrides the default hit/miss TTL.
+        """
+        if ttl_seconds is not None:
+            ttl = ttl_seconds
+        else:
+            ttl = self.IMAGE_CACHE_TTL_SECONDS if image_url else self.IMAGE_CACHE_MISS_TTL_SECONDS
+        with self._image_cache_lock:
+            self._image_cache[cache_key] = (time.monotonic() + ttl, image_url)
+            self._image_cache.move_to_end(cache_key)
+            while len(self._image_cache) > self.IMAGE_CACHE_MAX_ENTRIES:
+                self._image_cache.popitem(last=False)
+    
+    @staticmethod
+    def _redis_key(make: str, model: str, year: Optional[int], color: Optional[str]) -> str:
+        """Build the Redis key for a normalized (make, model, year, color) lookup."""
+        return f"img:{make}|{model}|{year or ''}|{color or ''}"
+    
+    def _redis_mget(self, keys: List[str]) -> List[Optional[str]]:
+        """
+        Read cached image URLs from Redis in a single MGET.
+        
+        Returns:
+            One entry per key: URL, "" for a cached miss, or None if absent/unavailable.
+        """
+        if self.redis is None or not keys:
+            return [None] * len(keys)
+        try:
+            values = self.redis.mget(keys)
         except Exception as e:
-            print(f"Error fetching car image for {make} {model}: {e}")
-            return self.get_fallback_image(make, model, year)
+            logger.warning("Redis image cache read failed: %s", e)
+            return [None] * len(keys)
+        return [value.decode() if value is not None else None for value in values]
     
-    def _search_pexels(
-        self, 
-        make: str, 
-        model: str, 
-        year: Optional[int] = None, 
-        color: Optional[str] = None
-    ) -> Optional[str]:
+    def _redis_set_many(self, entries: List[Tuple[str, str, int]]) -> None:
+        """Write (key, URL or "" for a miss, ttl_seconds) entries in one pipeline; failures are ignored."""
+        if self.redis is None or not entries:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value, ttl_seconds in entries:
+                pipe.setex(key, ttl_seconds, value)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("Redis image cache write failed: %s", e)
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Return image URL cache statistics for monitoring.
+        
+        Returns:
+            Dictionary with hits, misses, size and maxsize.
         """
-        Search Pexels API for car images.
+        with self._image_cache_lock:
+            return {
+                "hits": self._image_cache_hits,
+                "misses": self._image_cache_misses,
+                "size": len(self._image_cache),
+                "maxsize": self.IMAGE_CACHE_MAX_ENTRIES,
+            }
+    
+    def _search_car_photos(self, make: str, model: str) -> Optional[list]:
+        """
+        Search Pexels API for car photos of a make and model.
         
         Args:
             make: Car manufacturer
             model: Car model
-            year: Car year (optional)
-            color: Car color (optional)
         
         Returns:
-            Image URL if found, None otherwise.
+            Filtered list of car photos (empty if none found), or None if the request failed.
         """
         # Build query - ALWAYS include "car" and exclude motorcycles/models
-        best_query = None
-        if year and year > 0:
-            if color:
-                best_query = f"{year} {make} {model} {color} automobile car vehicle"
-            else:
-                best_query = f"{year} {make} {model} automobile car vehicle"
-        else:
-            best_query = f"{make} {model} automobile car vehicle"
+        best_query = f"{make} {model} automobile car vehicle"
         
         try:
-            headers = {"Authorization": self.api_key}
             search_params = {
                 "query": best_query,
-                "per_page": 15,  # Get more results to filter from
+                "per_page": 15,  # Get more results to filter from (and to vary per car)
                 "orientation": "landscape"
             }
             
-            response = requests.get(
+            response = self.session.get(
                 self.base_url, 
                 params=search_params, 
-                headers=headers, 
                 timeout=3
             )
             
@@ -121,29 +341,52 @@ class PexelsAPI:
                 photos = data.get("photos", [])
                 if photos and len(photos) > 0:
                     # Filter for car-specific images
-                    car_photos = self._filter_car_photos(photos, make, model)
-                    
-                    if car_photos:
-                        # Use hash to consistently pick different images for different cars
-                        car_hash = int(hashlib.md5(f"{make}{model}{year}{color}".encode()).hexdigest(), 16)
-                        photo_index = car_hash % len(car_photos)
-                        image_url = car_photos[photo_index]["src"]["large"]
-                        print(f"✅ Found CAR image for {year} {make} {model} ({color or 'any color'}) using query: '{best_query}'")
-                        return image_url
+                    return self._filter_car_photos(photos, make, model)
+                return []
             elif response.status_code == 401:
-                print(f"Pexels API key invalid. Check your PEXELS_API_KEY in .env")
+                logger.error("Pexels API key invalid. Check your PEXELS_API_KEY in .env")
             elif response.status_code == 429:
-                print(f"⚠️ Pexels rate limit reached. Using fallback images for remaining cars.")
+                logger.warning("Pexels rate limit reached. Using fallback images for remaining cars.")
             else:
-                print(f"Pexels API returned status {response.status_code} for query: '{best_query}'")
+                logger.warning("Pexels API returned status %s for query: '%s'", response.status_code, best_query)
         
         except requests.exceptions.Timeout:
-            print(f"Pexels API timeout for query: '{best_query}'")
+            logger.warning("Pexels API timeout for query: '%s'", best_query)
         except Exception as e:
-            print(f"Pexels API error for query '{best_query}': {e}")
+            logger.warning("Pexels API error for query '%s': %s", best_query, e)
         
         return None
     
+    def _pick_photo(
+        self, 
+        car_photos: list, 
+        make: str, 
+        model: str, 
+        year: Optional[int] = None, 
+        color: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Pick one photo URL for a car, consistently for the same year/color.
+        
+        Args:
+            car_photos: Non-empty list of photo objects for the car's make and model
+            make: Car manufacturer
+            model: Car model
+            year: Car year (optional)
+            color: Car color (optional)
+        
+        Returns:
+            Image URL, or None if the picked photo has no large image (treated like a failed search).
+        """
+        # Use hash to consistently pick different images for different cars
+        car_hash = zlib.crc32(f"{make}{model}{year}{color}".encode())
+        image_url = (car_photos[car_hash % len(car_photos)].get("src") or {}).get("large")
+        if not image_url:
+            logger.warning("Pexels photo without a large image for %s %s", make, model)
+            return None
+        logger.debug("Found car image for %s %s %s (%s)", year, make, model, color or 'any color')
+        return image_url
+    
     def _filter_car_photos(self, photos: list, make: str, model: str) -> list:
         """
         Filter photos to only include car-specific images.
@@ -156,16 +399,8 @@ class PexelsAPI:
         Returns:
             Filtered list of car photos.
         """
-        exclude_keywords = [
-            "motorcycle", "bike", "bicycle", "scooter", "model", 
-            "person", "people", "portrait", "fashion", "woman", 
-            "man", "girl", "boy"
-        ]
-        
-        car_keywords = [
-            "car", "automobile", "vehicle", "sedan", "suv", "coupe", 
-            "convertible", "hatchback", "sports car", "luxury car"
-        ]
+        make_lower = make.lower()
+        model_lower = model.lower()
         
         car_photos = []
         for photo in photos:
@@ -173,21 +408,21 @@ class PexelsAPI:
             url = photo.get("url", "").lower()
             
             # Skip if it contains excluded keywords
-            if any(excluded in alt_text or excluded in url for excluded in exclude_keywords):
+            if _EXCLUDE_KEYWORDS_RE.search(alt_text) or _EXCLUDE_KEYWORDS_RE.search(url):
                 continue
             
             # Must contain car-related keywords
-            if any(keyword in alt_text for keyword in car_keywords):
+            if _CAR_KEYWORDS_RE.search(alt_text):
                 car_photos.append(photo)
             # Also accept if make/model is mentioned
-            elif make.lower() in alt_text and model.lower() in alt_text:
+            elif make_lower in alt_text and model_lower in alt_text:
                 car_photos.append(photo)
         
         if car_photos:
             return car_photos
         else:
             # If no strict matches, use all photos but log a warning
-            print(f"⚠️ No strict car matches for {make} {model}, using all results")
+            logger.debug("No strict car matches for %s %s, using all results", make, model)
             return photos
     
     def get_fallback_image(self, make: str, model: str, year: Optional[int] = None) -> str:
@@ -202,22 +437,9 @@ class PexelsAPI:
         Returns:
             Fallback image URL.
         """
-        fallback_images = [
-            "https://images.pexels.com/photos/170811/pexels-photo-170811.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
-            "https://images.pexels.com/photos/116675/pexels-photo-116675.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
-            "https://images.pexels.com/photos/1592384/pexels-photo-1592384.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
-            "https://images.pexels.com/photos/1149137/pexels-photo-1149137.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
-            "https://images.pexels.com/photos/164634/pexels-photo-164634.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
-            "https://images.pexels.com/photos/3802508/pexels-photo-3802508.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
-            "https://images.pexels.com/photos/1545743/pexels-photo-1545743.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
-            "https://images.pexels.com/photos/1719647/pexels-photo-1719647.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
-            "https://images.pexels.com/photos/358070/pexels-photo-358070.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
-            "https://images.pexels.com/photos/210019/pexels-photo-210019.jpeg?auto=compress&cs=tinysrgb&w=800&h=600&fit=crop",
-        ]
-        
         # Use a consistent fallback based on make/model/year hash for variety
-        car_hash = int(hashlib.md5(f"{make}{model}{year}".encode()).hexdigest(), 16)
-        selected_image = fallback_images[car_hash % len(fallback_images)]
-        print(f"⚠️ Using fallback image for {year} {make} {model} (no specific image found)")
+        car_hash = zlib.crc32(f"{make}{model}{year}".encode())
+        selected_image = _FALLBACK_IMAGES[car_hash % len(_FALLBACK_IMAGES)]
+        logger.debug("Using fallback image for %s %s %s (no specific image found)", year, make, model)
         return selected_image
 
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useSearchParams, Link, useNavigate } from 'react-router-dom';
 import { Navbar } from '@/components/Navbar';
 import { CarCard, Car } from '@/components/CarCard';
@@ -9,7 +9,7 @@ import { ArrowLeft, Search, Send, Sparkles, Loader2 } from 'lucide-react';
 import { useAuth } from '@/contexts/AuthContext';
 import { supabase, isSupabaseReady } from '@/integrations/supabase/client';
 import { useToast } from '@/hooks/use-toast';
-import { searchCars, searchCarsWithFilters } from '@/services/api';
+import { searchCarsWithFilters, streamSearchCars } from '@/services/api';
 
 const initialFilters: Filters = {
   bodyTypes: [],
@@ -37,6 +37,11 @@ const Results = () => {
   const navigate = useNavigate();
   const { user } = useAuth();
   const { toast } = useToast();
+  // Controller of the latest search; starting a new search aborts the previous one
+  const searchControllerRef = useRef<AbortController | null>(null);
+
+  // Stop any open result stream when leaving the page
+  useEffect(() => () => searchControllerRef.current?.abort(), []);
 
   // Load filters from URL params and perform search
   useEffect(() => {
@@ -72,6 +77,10 @@ const Results = () => {
   const performSearch = async (loadMore: boolean = false, searchFilters?: Filters) => {
     // Use provided filters or current state filters
     const activeFilters = searchFilters || filters;
+    // Supersede any search still in flight, so its results cannot land in this one's list
+    searchControllerRef.current?.abort();
+    const controller = new AbortController();
+    searchControllerRef.current = controller;
     if (loadMore) {
       setIsLoadingMore(true);
     } else {
@@ -98,20 +107,40 @@ const Results = () => {
       // Use last_id for pagination if loading more
       const cursorId = loadMore ? lastId : null;
 
-      if (hasFilters || !query.trim()) {
+      const useFilteredSearch = hasFilters || !query.trim();
+      if (useFilteredSearch) {
         // Use filtered search
         response = await searchCarsWithFilters(activeFilters, query.trim() || undefined, cursorId);
       } else {
-        // Use AI search
-        response = await searchCars(query.trim(), activeFilters, cursorId);
+        // Use AI search - cars are appended as they stream in
+        response = await streamSearchCars(
+          query.trim(),
+          (car) => {
+            if (controller.signal.aborted) {
+              return;
+            }
+            setCars(prev => [...prev, car]);
+            setIsLoading(false);
+          },
+          cursorId,
+          controller.signal
+        );
       }
 
-      if (loadMore) {
-        // Append new results to existing ones
-        setCars(prev => [...prev, ...response.cars]);
-      } else {
-        // Replace results with new search
-        setCars(response.cars);
+      // A newer search has started; its results replace this one's
+      if (controller.signal.aborted) {
+        return;
+      }
+
+      // Streamed AI results were already added as they arrived
+      if (useFilteredSearch) {
+        if (loadMore) {
+          // Append new results to existing ones
+          setCars(prev => [...prev, ...response.cars]);
+        } else {
+          // Replace results with new search
+          setCars(response.cars);
+        }
       }
 
       // Update cursor for next page
@@ -127,6 +156,9 @@ const Results = () => {
         });
       }
     } catch (error) {
+      if (controller.signal.aborted) {
+        return;
+      }
       console.error('Search error:', error);
       if (!loadMore) {
         toast({
@@ -143,8 +175,11 @@ const Results = () => {
         });
       }
     } finally {
-      setIsLoading(false);
-      setIsLoadingMore(false);
+      // Loading state belongs to the newer search if this one was superseded
+      if (!controller.signal.aborted) {
+        setIsLoading(false);
+        setIsLoadingMore(false);
+      }
     }
   };
 
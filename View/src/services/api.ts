@@ -30,6 +30,7 @@ export interface SearchResponse {
   count: number;
   query?: string;
   last_id?: string | number | null; // Cursor for pagination
+  prefetchUrls?: string[]; // Result image URLs to prefetch while idle
 }
 
 export interface ApiError {
@@ -87,6 +88,35 @@ function normalizeCar(car: any): Car {
   };
 }
 
+/**
+ * Add <link rel="prefetch"> tags for result images when the browser is idle,
+ * so they are cached by the time the results grid renders
+ */
+function prefetchImages(urls?: string[]): void {
+  if (!urls || urls.length === 0 || typeof document === 'undefined') {
+    return;
+  }
+
+  const inject = () => {
+    for (const href of urls) {
+      if (document.head.querySelector(`link[rel="prefetch"][href="${CSS.escape(href)}"]`)) {
+        continue;
+      }
+      const link = document.createElement('link');
+      link.rel = 'prefetch';
+      link.as = 'image';
+      link.href = href;
+      document.head.appendChild(link);
+    }
+  };
+
+  if ('requestIdleCallback' in window) {
+    window.requestIdleCallback(inject);
+  } else {
+    setTimeout(inject, 0);
+  }
+}
+
 /**
  * Make a request to the API with error handling
  */
@@ -150,6 +180,7 @@ export async function searchCars(
       method: 'POST',
       body: JSON.stringify(requestBody),
     });
+    prefetchImages(response.prefetchUrls);
 
     // Normalize car data
     return {
@@ -162,6 +193,79 @@ export async function searchCars(
   }
 }
 
+/**
+ * AI-powered car search, streamed
+ * Calls onCar for each car as soon as the backend has its image, then resolves
+ * with the full response (cars in arrival order)
+ * @param query - Search query string
+ * @param onCar - Called once per car as it arrives
+ * @param last_id - Optional cursor for pagination (ID of last car from previous search)
+ * @param signal - Optional AbortSignal; aborting stops the stream and no further onCar calls are made
+ */
+export async function streamSearchCars(
+  query: string,
+  onCar: (car: Car) => void,
+  last_id?: string | number | null,
+  signal?: AbortSignal
+): Promise<SearchResponse> {
+  const requestBody: any = { query: query.trim() };
+  if (last_id !== undefined && last_id !== null) {
+    requestBody.last_id = last_id;
+  }
+
+  const response = await fetch(`${API_URL}/api/search/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(requestBody),
+    signal,
+  });
+
+  if (!response.ok || !response.body) {
+    const errorData: ApiError = await response.json().catch(() => ({
+      error: `HTTP ${response.status}: ${response.statusText}`,
+    }));
+    throw new Error(errorData.error || `HTTP ${response.status}: ${response.statusText}`);
+  }
+
+  // First line is the summary ({count, query, hasMore, last_id}), then one car per line
+  let summary: any = null;
+  const cars: Car[] = [];
+  const handleLine = (line: string) => {
+    if (!line.trim() || signal?.aborted) {
+      return;
+    }
+    const data = JSON.parse(line);
+    if (summary === null) {
+      summary = data;
+      return;
+    }
+    const car = normalizeCar(data);
+    cars.push(car);
+    onCar(car);
+  };
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) {
+      break;
+    }
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split('\n');
+    buffered = lines.pop() ?? '';
+    lines.forEach(handleLine);
+  }
+  handleLine(buffered + decoder.decode());
+
+  return {
+    ...(summary || {}),
+    cars,
+    count: cars.length,
+  };
+}
+
 /**
  * Filter-based car search
  * Uses specific filters to find cars
@@ -212,6 +316,7 @@ export async function searchCarsWithFilters(
       method: 'POST',
       body: JSON.stringify(requestBody),
     });
+    prefetchImages(response.prefetchUrls);
 
     // Normalize car data
     return {
@@ -233,6 +338,7 @@ export async function getAllCars(limit: number = 10): Promise<SearchResponse> {
     const response = await apiRequest<SearchResponse>(`/api/cars?limit=${limit}`, {
       method: 'GET',
     });
+    prefetchImages(response.prefetchUrls);
 
     return {
       ...response,
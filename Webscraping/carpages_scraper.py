@@ -3,12 +3,18 @@ carpages.ca Scraper Implementation
 Implements the Scraper interface to scrape car listings from carpages.ca website.
 """
 import csv
+import multiprocessing
 import os
 import random
-import time
+import re
 from collections import defaultdict
+from functools import lru_cache
 from time import sleep
+from urllib.parse import urljoin
 
+import httpx
+import lxml.html
+from lxml import etree
 from selenium import webdriver
 from selenium.common import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.by import By
@@ -21,13 +27,138 @@ import undetected_chromedriver as uc
 from Webscraping.scraper_interface import Scraper
 
 
+# Resources the scraper never reads (listing data is all in the HTML). Stylesheets stay
+# loaded so the pagination link and cookie banner keep their normal layout.
+_BLOCKED_URL_PATTERNS = (
+    "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.svg",
+    "*.woff", "*.woff2", "*.ttf", "*.mp4", "*.webm",
+    "*doubleclick*", "*googlesyndication*", "*google-analytics*", "*googletagmanager*",
+)
+
+
+CARPAGES_HOME = "https://www.carpages.ca"
+CHROME_VERSION_MAIN = 145
+
+# Headers for the one plain HTTP request (category discovery), matching the scraping browser
+_BROWSER_HEADERS = {
+    "User-Agent": (f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   f"(KHTML, like Gecko) Chrome/{CHROME_VERSION_MAIN}.0.0.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-CA,en;q=0.9",
+}
+
+# CSV columns; scraped rows are tuples in this order
+FIELDNAMES = ("year", "make", "model", "price", "mileage", "color", "url", "body_type")
+_BODY_TYPE_INDEX = FIELDNAMES.index("body_type")
+
+# Selenium selectors used while paging through a category
+_LISTING_CONTAINER_CSS = "div[class*='tw:laptop:col-span-8']"
+_PAGE_INDICATOR_CSS = "span[class*='tw:font-bold']"
+
+# XPath equivalents used to parse the page source, compiled once. Text fields use
+# normalize-space() so lxml returns the first match's trimmed text directly; smart_strings=False
+# keeps the results plain str instead of references into (and keeping alive) the page tree.
+def _xpath(expression):
+    return etree.XPath(expression, smart_strings=False)
+
+
+_CATEGORY_LINKS = _xpath("//div[contains(concat(' ', normalize-space(@class), ' '), ' category-jellybeans ')]//a/@href")
+_LISTING_CONTAINERS = _xpath(".//div[contains(@class, 'tw:laptop:col-span-8')]")
+_LISTINGS = _xpath(".//div[contains(@class, 'tw:flex') and contains(@class, 'tw:p-6')]")
+_HEADER_TEXT = _xpath("normalize-space(.//h4)")
+_HREFS = _xpath(".//a/@href")
+_PRICE_TEXT = _xpath("normalize-space(.//span[contains(@class, 'tw:font-bold tw:text-xl')])")
+_MILEAGE_BOXES = _xpath(
+    ".//div[contains(@class, 'tw:col-span-full tw:mobile-lg:col-span-6 tw:laptop:col-span-4')]"
+    "//div[contains(@class, 'tw:text-gray-500')]"
+)
+_MILEAGE_NUMBERS = _xpath(".//*[contains(concat(' ', normalize-space(@class), ' '), ' number ')]")
+_COLOR_TEXT = _xpath("normalize-space(.//span[contains(@class, 'tw:text-sm tw:font-bold')])")
+
+# Characters dropped from price/mileage text before int() ("$12,345" -> "12345")
+_NUMBER_STRIP = str.maketrans("", "", "$, \t\n")
+
+# Basic color names, matched as substrings of the listing's color text
+_BASIC_COLOR_RE = re.compile(
+    "black|white|red|blue|green|yellow|orange|purple|pink|brown|beige|gray|grey|silver|gold"
+)
+
+
+# Page titles that mean a CAPTCHA/Cloudflare challenge, and titles of real carpages.ca pages
+SUSPICIOUS_TITLES = ("Just a moment", "Security Check", "Access denied", "Attention Required",
+                     "Checking your browser", "reCAPTCHA", "Cloudflare")
+ACCURATE_TITLES = ("New and Used", "Carpages.ca")
+
+# Challenge redirects usually finish within a second; ask for manual help after this long
+CAPTCHA_NOTICE_AFTER_SECONDS = 3
+CAPTCHA_MAX_WAIT_SECONDS = 10
+
+
+def _on_listing_page(driver):
+    """WebDriverWait condition: True once the browser shows a carpages.ca page rather than a challenge."""
+    title = driver.title
+    return not any(t in title for t in SUSPICIOUS_TITLES) and any(t in title for t in ACCURATE_TITLES)
+
+
+def _parse_price(text):
+    """Return a listing price as an int: "$12,345" -> 12345, cents rounded, 0 if not a number."""
+    digits = text.translate(_NUMBER_STRIP)
+    try:
+        # Whole-dollar prices (the usual case) skip the float round-trip
+        return int(digits)
+    except ValueError:
+        pass
+    try:
+        return int(round(float(digits)))
+    except (ValueError, OverflowError):
+        return 0
+
+
+@lru_cache(maxsize=32)
+def _normalize_body_type(header_text):
+    """Map a category page's h1 ("New and Used SUVs for Sale") to its body_type ("SUV")."""
+    if "New and Used" in header_text:
+        body_type = header_text.replace("New and Used ", "").replace(" for Sale", "")
+    else:
+        body_type = header_text
+    if body_type == "Cars":
+        return "hybrid"
+    if "Hatchbacks" in body_type:
+        return "Hatchback"
+    if "SUV" in body_type:
+        return "SUV"
+    if "Minivan" in body_type:
+        return "Minivan"
+    return body_type[:-1]
+
+
+def _scrape_category_in_worker(data_dir, category_url, idx, total):
+    """
+    Scrape one category in its own browser (multiprocessing worker; WebDriver is not thread-safe).
+    Manual CAPTCHA solving is not possible here, so a category stuck on a challenge is skipped.
+    Returns the scraped rows.
+    """
+    scraper = CarPagesScraper(data_dir=data_dir)
+    try:
+        scraper.driver = scraper._create_driver(multi_procs=True)
+        scraper._open_homepage()
+        scraper._scrape_category(category_url, idx, total)
+    except Exception as e:
+        print(f"Skip {category_url} because of error: {e}")
+    finally:
+        if scraper.driver:
+            scraper.driver.quit()
+    return scraper.all_rows
+
+
 class CarPagesScraper(Scraper):
      # Implements the Scraper Interface
     
-    def __init__(self, data_dir: str = None):
+    def __init__(self, data_dir: str = None, workers: int = 1):
         """
         Initialize the CarPages scraper.
-        Passes directory to save CSV files.
+        Passes directory to save CSV files, and how many categories to scrape at once
+        (each in its own browser process; 1 keeps the single-browser crawl).
         """
         if data_dir is None:
             current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -38,6 +169,7 @@ class CarPagesScraper(Scraper):
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
         
+        self.workers = max(1, workers)
         self.driver = None
         self.all_rows = []
         self.category_rows = defaultdict(list)
@@ -54,15 +186,14 @@ class CarPagesScraper(Scraper):
         self.all_rows = []
         self.category_rows = defaultdict(list)
         
-        # Create driver
-        self.driver = self._create_driver()
-        
+        # The browser is started on demand (category discovery usually doesn't need it)
         try:
             # Perform the actual scraping
             self._scrape_carpages_ca()
         finally:
             if self.driver:
                 self.driver.quit()
+                self.driver = None
         
         # Save to CSV files
         if self.all_rows:
@@ -71,29 +202,33 @@ class CarPagesScraper(Scraper):
         else:
             print("No listings scraped; CSVs not written.")
     
-    def _create_driver(self):
-        """Create a new Chrome driver. Used when restarting browser between categories to reset cache."""
-        driver = uc.Chrome(options=self._no_location_options(), version_main=145)
+    def _create_driver(self, multi_procs=False):
+        """
+        Create a new Chrome driver (also used as the fallback when an in-place reset fails).
+        multi_procs lets several processes start drivers at once without re-patching the shared binary.
+        """
+        driver = uc.Chrome(options=self._no_location_options(), version_main=CHROME_VERSION_MAIN, user_multi_procs=multi_procs)
         driver.set_page_load_timeout(15)
         driver.implicitly_wait(5)
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(_BLOCKED_URL_PATTERNS)})
+        except Exception as e:
+            print(f"Resource blocking not enabled: {e}")
         return driver
     
     def _scrape_carpages_ca(self):
         """Internal method to scrape carpages.ca"""
-        # Open webpage and wait to load
-        self.driver.get("https://www.carpages.ca")
-        WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        
-        # Handle cookie requests before scraping
-        self._cookie_handler(self.driver)
-        
-        # Get URL links for each category
-        category_container = self.driver.find_element(By.CSS_SELECTOR, "div.category-jellybeans")
-        categories = category_container.find_elements(By.TAG_NAME, "a")
-        raw_urls = [c.get_attribute("href") for c in categories if c.get_attribute("href")]
+        # Get URL links for each category, from the static homepage HTML when possible
+        raw_urls = self._discover_categories_over_http() or self._discover_categories_in_browser()
         
         # Remove duplicates
         category_urls = list(dict.fromkeys(raw_urls))
+        
+        if self.workers > 1:
+            self._scrape_categories_in_parallel(category_urls)
+            return
+        
         visited_urls = set()
         
         # Access each category webpage with intercategory restart
@@ -102,50 +237,127 @@ class CarPagesScraper(Scraper):
                 print(f"Skipping already visited category: {category_url}")
                 continue
             
-            # Restart browser between categories (except first one)
-            if idx > 0:
-                print(f"\n >> Restarting browser between categories (cache reset)...")
-                self.driver.quit()
-                sleep(2)
+            # Start the browser for the first category, restart it between the others
+            if self.driver is None:
                 self.driver = self._create_driver()
+                self._open_homepage()
+            elif idx > 0:
+                print(f"\n >> Resetting browser between categories (cache reset)...")
+                self._reset_browser()
                 
                 # Re-initialize: go to homepage and handle cookies
-                self.driver.get("https://www.carpages.ca")
-                try:
-                    WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                except TimeoutException:
-                    pass
-                self._cookie_handler(self.driver)
-                print(" >> Browser restarted and ready.")
+                self._open_homepage()
+                print(" >> Browser reset and ready.")
             
-            try:
-                self._navigate_page_count = 0
-                print(f"\n >> Requesting category {idx + 1}/{len(category_urls)}: {category_url}...", end=" ", flush=True)
-                self.driver.get(category_url)
-                try:
-                    WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                except TimeoutException:
-                    pass
-                print("Done.", flush=True)
-                
-                self._bypass_captcha(self.driver)
-                self._navigate_category(category_url)
-                sleep(random.uniform(2, 4))
+            if self._scrape_category(category_url, idx, len(category_urls)):
                 visited_urls.add(category_url)
-                
+    
+    def _scrape_categories_in_parallel(self, category_urls):
+        """Scrape categories across self.workers browser processes and merge their rows."""
+        if self.driver is None:
+            # Workers start with user_multi_procs, which reuses an already patched chromedriver
+            uc.Patcher(version_main=CHROME_VERSION_MAIN).auto()
+        else:
+            # The discovery browser isn't needed while the workers run
+            self.driver.quit()
+            self.driver = None
+        
+        total = len(category_urls)
+        if not total:
+            return
+        jobs = [(self.data_dir, url, idx, total) for idx, url in enumerate(category_urls)]
+        print(f"\n >> Scraping {total} categories with {self.workers} browser processes...")
+        with multiprocessing.Pool(processes=min(self.workers, total)) as pool:
+            for rows in pool.starmap(_scrape_category_in_worker, jobs):
+                self.all_rows.extend(rows)
+                for row in rows:
+                    self.category_rows[row[_BODY_TYPE_INDEX]].append(row)
+    
+    def _discover_categories_over_http(self):
+        """Read category URLs from the homepage HTML without a browser. Returns [] if blocked or unavailable."""
+        try:
+            response = httpx.get(CARPAGES_HOME, headers=_BROWSER_HEADERS, timeout=10, follow_redirects=True)
+            document = lxml.html.fromstring(response.content)
+        except Exception as e:
+            print(f"Category discovery over HTTP failed ({e}), using the browser.")
+            return []
+        
+        title = document.findtext(".//title") or ""
+        if response.status_code != 200 or any(t in title for t in SUSPICIOUS_TITLES):
+            print("Homepage answered with a challenge, using the browser for category discovery.")
+            return []
+        return [urljoin(str(response.url), href) for href in _CATEGORY_LINKS(document)]
+    
+    def _discover_categories_in_browser(self):
+        """Read category URLs from the homepage in Chrome (starts the browser)."""
+        self.driver = self._create_driver()
+        
+        # Open webpage and wait to load
+        self.driver.get(CARPAGES_HOME)
+        WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        
+        # Handle cookie requests before scraping
+        self._cookie_handler(self.driver)
+        
+        category_container = self.driver.find_element(By.CSS_SELECTOR, "div.category-jellybeans")
+        categories = category_container.find_elements(By.TAG_NAME, "a")
+        return [c.get_attribute("href") for c in categories if c.get_attribute("href")]
+    
+    def _reset_browser(self):
+        """
+        Clear the browser's cache, cookies and carpages.ca storage in place, which is much
+        cheaper than relaunching Chrome. Falls back to a full restart if DevTools fails.
+        """
+        try:
+            self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            self.driver.execute_cdp_cmd("Storage.clearDataForOrigin",
+                                        {"origin": CARPAGES_HOME, "storageTypes": "all"})
+        except Exception as e:
+            print(f" >> In-place reset failed ({e}), restarting browser...")
+            self.driver.quit()
+            sleep(2)
+            self.driver = self._create_driver()
+    
+    def _open_homepage(self):
+        """Load the homepage and dismiss the cookie banner (start of each browser session)."""
+        self.driver.get(CARPAGES_HOME)
+        try:
+            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        except TimeoutException:
+            pass
+        self._cookie_handler(self.driver)
+    
+    def _scrape_category(self, category_url, idx, total):
+        """Scrape every page of one category. Returns True if the category was visited."""
+        try:
+            self._navigate_page_count = 0
+            print(f"\n >> Requesting category {idx + 1}/{total}: {category_url}...", end=" ", flush=True)
+            self.driver.get(category_url)
+            try:
+                WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
             except TimeoutException:
-                print("Page load timed out! Forcing stop to continue scraping.")
-                self.driver.execute_script("window.stop();")
-                self._bypass_captcha(self.driver)
-                self._navigate_category(category_url)
-                visited_urls.add(category_url)
-                
-            except Exception as e:
-                print(f"Skip {category_url} because of error: {e}")
-                continue
+                pass
+            print("Done.", flush=True)
+            
+            self._bypass_captcha(self.driver)
+            self._navigate_category(category_url)
+            sleep(random.uniform(2, 4))
+            return True
+            
+        except TimeoutException:
+            print("Page load timed out! Forcing stop to continue scraping.")
+            self.driver.execute_script("window.stop();")
+            self._bypass_captcha(self.driver)
+            self._navigate_category(category_url)
+            return True
+            
+        except Exception as e:
+            print(f"Skip {category_url} because of error: {e}")
+            return False
     
     def _navigate_category(self, category_url):
-        """Navigate through pages in the same category and make it restart every 50 pages to reset cache."""
+        """Navigate through pages in the same category and reset the browser every 50 pages to clear its cache."""
         print(f"Navigating in {self.driver.title}")
         self._navigate_page_count = 0
         
@@ -163,21 +375,7 @@ class CarPagesScraper(Scraper):
         
         # Get body_type once at the start, Normalize it to a consistent format.
         try:
-            header_text = self.driver.find_element(By.TAG_NAME, "h1").text
-            if "New and Used" in header_text:
-                body_type = header_text.replace("New and Used ", "").replace(" for Sale", "")
-            else:
-                body_type = header_text
-            if body_type == "Cars":
-                body_type = "hybrid"
-            elif "Hatchbacks" in body_type:
-                body_type = "Hatchback"
-            elif "SUV" in body_type:
-                body_type = "SUV"
-            elif "Minivan" in body_type:
-                body_type = "Minivan"
-            else:
-                body_type = body_type[:-1]
+            body_type = _normalize_body_type(self.driver.find_element(By.TAG_NAME, "h1").text)
         except Exception as e:
             print(f" >> Error extracting body_type: {e}")
             return
@@ -195,10 +393,8 @@ class CarPagesScraper(Scraper):
                 # Intracategory restart
                 if self._navigate_page_count > 0 and self._navigate_page_count % INTRACATEGORY_RESTART_INTERVAL == 0:
                     current_page_url = self.driver.current_url
-                    print(f"\n >> Intracategory restart at page {self._navigate_page_count} (cache reset)...")
-                    self.driver.quit()
-                    sleep(2)
-                    self.driver = self._create_driver()
+                    print(f"\n >> Intracategory reset at page {self._navigate_page_count} (cache reset)...")
+                    self._reset_browser()
                     
                     self.driver.get(current_page_url)
                     try:
@@ -207,10 +403,10 @@ class CarPagesScraper(Scraper):
                         pass
                     self._bypass_captcha(self.driver)
                     self._cookie_handler(self.driver)
-                    print(" >> Browser restarted, continuing from same page.")
+                    print(" >> Browser reset, continuing from same page.")
                     
                     try:
-                        last_container = self.driver.find_element(By.CSS_SELECTOR, "div[class*='tw:laptop:col-span-8']")
+                        last_container = self.driver.find_element(By.CSS_SELECTOR, _LISTING_CONTAINER_CSS)
                     except Exception:
                         last_container = None
                 
@@ -233,13 +429,13 @@ class CarPagesScraper(Scraper):
                 if proceed_to_next:
                     prev_url = self.driver.current_url
                     try:
-                        page_indicator = self.driver.find_element(By.CSS_SELECTOR, "span[class*='tw:font-bold']")
+                        page_indicator = self.driver.find_element(By.CSS_SELECTOR, _PAGE_INDICATOR_CSS)
                         prev_page_text = page_indicator.text
                     except Exception:
                         prev_page_text = None
                     
                     try:
-                        old_container = self.driver.find_element(By.CSS_SELECTOR, "div[class*='tw:laptop:col-span-8']")
+                        old_container = self.driver.find_element(By.CSS_SELECTOR, _LISTING_CONTAINER_CSS)
                     except Exception:
                         old_container = None
                     
@@ -256,7 +452,7 @@ class CarPagesScraper(Scraper):
                                     return True
                             if prev_page_text:
                                 try:
-                                    new_indicator = driver.find_element(By.CSS_SELECTOR, "span[class*='tw:font-bold']")
+                                    new_indicator = driver.find_element(By.CSS_SELECTOR, _PAGE_INDICATOR_CSS)
                                     if new_indicator.text != prev_page_text:
                                         return True
                                 except:
@@ -265,7 +461,7 @@ class CarPagesScraper(Scraper):
                         
                         WebDriverWait(self.driver, 4).until(page_has_changed)
                         WebDriverWait(self.driver, 3).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "div[class*='tw:laptop:col-span-8']"))
+                            EC.presence_of_element_located((By.CSS_SELECTOR, _LISTING_CONTAINER_CSS))
                         )
                         print(" >> Page loaded successfully.")
                         
@@ -276,13 +472,13 @@ class CarPagesScraper(Scraper):
                                 last_url = current_url
                     except TimeoutException:
                         try:
-                            test_container = self.driver.find_element(By.CSS_SELECTOR, "div[class*='tw:laptop:col-span-8']")
+                            test_container = self.driver.find_element(By.CSS_SELECTOR, _LISTING_CONTAINER_CSS)
                             current_url = self.driver.current_url
                             
                             page_changed = False
                             if prev_page_text:
                                 try:
-                                    new_indicator = self.driver.find_element(By.CSS_SELECTOR, "span[class*='tw:font-bold']")
+                                    new_indicator = self.driver.find_element(By.CSS_SELECTOR, _PAGE_INDICATOR_CSS)
                                     if new_indicator.text != prev_page_text:
                                         page_changed = True
                                 except:
@@ -303,13 +499,7 @@ class CarPagesScraper(Scraper):
                     print("No link found. Must be last page of category.")
                     rows_for_category = self.category_rows.get(body_type, [])
                     if rows_for_category:
-                        # Randomize order before saving
-                        randomized_category_rows = rows_for_category.copy()
-                        random.shuffle(randomized_category_rows)
-                        safe_name = body_type.lower().replace(" ", "_")
-                        filename = f"car_listings_{safe_name}.csv"
-                        filepath = os.path.join(self.data_dir, filename)
-                        self._write_rows_to_csv(randomized_category_rows, filepath=filepath)
+                        filepath = self._save_category_csv(body_type, rows_for_category)
                         print(f"Saved {len(rows_for_category)} listings to {filepath}")
                     return
                     
@@ -326,19 +516,29 @@ class CarPagesScraper(Scraper):
         
         try:
             page_car_listing_container = WebDriverWait(self.driver, 8).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[class*='tw:laptop:col-span-8']"))
+                EC.presence_of_element_located((By.CSS_SELECTOR, _LISTING_CONTAINER_CSS))
             )
             self._navigate_page_count += 1
             print(f"Navigating page {self._navigate_page_count} in {self.driver.title}")
             
-            car_listings = page_car_listing_container.find_elements(By.CSS_SELECTOR,
-                    "div[class*='tw:flex'][class*='tw:p-6']")
+            # Read the page once and parse it locally, instead of one driver round-trip
+            # per field per listing
+            page_url = self.driver.current_url
+            document = lxml.html.fromstring(self.driver.page_source)
+            containers = _LISTING_CONTAINERS(document)
+            car_listings = _LISTINGS(containers[0]) if containers else []
             if not car_listings:
                 print("No car listing found.")
             else:
                 print(f"Found {len(car_listings)} car listings on this page.")
+                # body_type is fixed for the page, so resolve its row list once
+                category_rows = self.category_rows[body_type]
+                all_rows = self.all_rows
                 for car_listing in car_listings:
-                    self._extract_data_from_listing(car_listing, body_type)
+                    row = self._extract_data_from_listing(car_listing, body_type, page_url)
+                    if row is not None:
+                        all_rows.append(row)
+                        category_rows.append(row)
             return page_car_listing_container
         except (NoSuchElementException, TimeoutException):
             return None
@@ -346,75 +546,47 @@ class CarPagesScraper(Scraper):
             print(f"(Error navigating page: {e})")
             return None
     
-    def _extract_data_from_listing(self, car_listing, body_type):
-        """Extract data from a single car listing"""
-        listing_header = car_listing.find_element(By.TAG_NAME, "h4").text
-        year = listing_header.split(" ")[0]
-        make = listing_header.split(" ")[1]
-        model = listing_header.split(" ")[2]
-        href_link = car_listing.find_element(By.TAG_NAME, "a").get_attribute("href")
-        price = car_listing.find_element(By.CSS_SELECTOR,
-                                         "span[class*='tw:font-bold tw:text-xl']").text
+    def _extract_data_from_listing(self, car_listing, body_type, page_url):
+        """Extract one row from a car listing (an lxml element from the page source), or None to skip it"""
+        header_words = _HEADER_TEXT(car_listing).split()
+        # Skip cards that aren't regular listings (no "year make model" header)
+        if len(header_words) < 3:
+            return None
+        year, make, model = header_words[:3]
+        hrefs = _HREFS(car_listing)
+        href_link = urljoin(page_url, hrefs[0]) if hrefs else ""
+        price = _PRICE_TEXT(car_listing)
         
         # Skip listing if price says "CALL", since there is no point to scraping it.
         if price.upper().strip() == "CALL":
-            return
+            return None
         
-        price_clean = price.replace("$", "").replace(",", "").strip()
-        try:
-            price = int(round(float(price_clean)))
-        except (ValueError, TypeError):
-            price = 0
-        
-        mileage_header_box = car_listing.find_element(By.CSS_SELECTOR,
-                        "div[class*='tw:col-span-full tw:mobile-lg:col-span-6 tw:laptop:col-span-4']")
-        mileage_box = mileage_header_box.find_element(By.CSS_SELECTOR,
-                                                  "div[class*='tw:text-gray-500']")
-        raw_mileage = mileage_box.text
+        price = _parse_price(price)
+        
+        mileage_boxes = _MILEAGE_BOXES(car_listing)
+        mileage_box = mileage_boxes[0] if mileage_boxes else None
+        raw_mileage = mileage_box.text_content() if mileage_box is not None else ""
         car_mileage = 0
         
         # Extract mileage, check if mileage exists, sometimes mileage is listed as "CALL" so we skip it.
         if "CALL" not in raw_mileage and raw_mileage.strip() != "":
-            mileage_number_list = mileage_box.find_elements(By.CLASS_NAME, "number")
-            temp_mileage = ""
-            for num in mileage_number_list:
-                temp_mileage += num.text
-            
-            clean_mileage = temp_mileage.replace(",", "").strip()
+            mileage_number_list = _MILEAGE_NUMBERS(mileage_box)
+            clean_mileage = "".join(num.text_content() for num in mileage_number_list).translate(_NUMBER_STRIP)
             if clean_mileage.isdigit():
-                car_mileage = int(round(float(clean_mileage)))
+                car_mileage = int(clean_mileage)
         
-        color_raw = car_listing.find_element(By.CSS_SELECTOR,
-                                         "span[class*='tw:text-sm tw:font-bold']").text
+        color_raw = _COLOR_TEXT(car_listing)
         color = self._normalize_color(color_raw)
         
-        row = {
-            "year": year,
-            "make": make,
-            "model": model,
-            "price": price,
-            "mileage": car_mileage,
-            "color": color,
-            "url": href_link,
-            "body_type": body_type
-        }
-        self.all_rows.append(row)
-        self.category_rows[body_type].append(row)
+        # A tuple (in FIELDNAMES order) is a fraction of a dict's size per row
+        return (year, make, model, price, car_mileage, color, href_link, body_type)
     
     def _normalize_color(self, raw_color):
         """Normalize color to basic color term"""
-        color_str = (raw_color or "").lower()
-        basic_colors = [
-            "black", "white", "red", "blue", "green", "yellow",
-            "orange", "purple", "pink", "brown", "beige", "gray",
-            "grey", "silver", "gold"
-        ]
-        
-        for base in basic_colors:
-            if base in color_str:
-                if base in ("gray", "grey"):
-                    return "gray"
-                return base
+        match = _BASIC_COLOR_RE.search((raw_color or "").lower())
+        if match:
+            base = match.group()
+            return "gray" if base == "grey" else base
         
         return raw_color.split()[0].lower() if raw_color else "Other"
     
@@ -438,7 +610,9 @@ class CarPagesScraper(Scraper):
         chrome_options = Options()
         prefs = {
             "profile.default_content_setting_values.geolocation": 2,
-            "profile.default_content_setting_values.notifications": 2
+            "profile.default_content_setting_values.notifications": 2,
+            # Don't download car photos; only the HTML is scraped
+            "profile.managed_default_content_settings.images": 2
         }
         chrome_options.add_experimental_option("prefs", prefs)
         chrome_options.page_load_strategy = 'none'
@@ -450,72 +624,59 @@ class CarPagesScraper(Scraper):
     
     def _bypass_captcha(self, driver):
         """Handle CAPTCHA/Cloudflare challenges"""
-        suspicious_titles = ["Just a moment", "Security Check", "Access denied", "Attention Required",
-                             "Checking your browser", "reCAPTCHA", "Cloudflare"]
-        accurate_titles = ["New and Used", "Carpages.ca"]
+        # Poll the title every 100ms so the scrape resumes as soon as the redirect lands
+        wait = WebDriverWait(driver, CAPTCHA_NOTICE_AFTER_SECONDS, poll_frequency=0.1)
+        try:
+            wait.until(_on_listing_page)
+            return
+        except TimeoutException:
+            pass
         
-        max_wait = 10
-        start_time = time.time()
-        sound_played = False
+        print(" >> Waiting for page redirect...")
+        wait = WebDriverWait(driver, CAPTCHA_MAX_WAIT_SECONDS - CAPTCHA_NOTICE_AFTER_SECONDS, poll_frequency=0.1)
+        try:
+            wait.until(_on_listing_page)
+            return
+        except TimeoutException:
+            pass
         
-        while True:
-            current_title = driver.title
-            different_page = any(t in current_title for t in suspicious_titles)\
-                             or not any(t in current_title for t in accurate_titles)
-            
-            if not different_page:
-                return
-            
-            elapsed = time.time() - start_time
-            
-            if elapsed >= max_wait:
-                if not sound_played:
-                    try:
-                        os.system('afplay /System/Library/Sounds/Glass.aiff')
-                        sound_played = True
-                    except Exception:
-                        pass
-                
-                print("\n" + "!" * 50)
-                print(f"!!! STUCK ON: {current_title} !!!")
-                print("Auto-redirect failed. Please solve manually in browser.")
-                print("!" * 50 + "\n")
-                
-                input("Press Enter to resume script...")
-                return
-            
-            if elapsed > 3:
-                print(f" >> Waiting for page redirect: ({int(elapsed)}s)")
-            time.sleep(1)
+        try:
+            os.system('afplay /System/Library/Sounds/Glass.aiff')
+        except Exception:
+            pass
+        
+        print("\n" + "!" * 50)
+        print(f"!!! STUCK ON: {driver.title} !!!")
+        print("Auto-redirect failed. Please solve manually in browser.")
+        print("!" * 50 + "\n")
+        
+        input("Press Enter to resume script...")
     
     def _write_rows_to_csv(self, rows, filepath="car_listings.csv"):
         """Write rows to a CSV file"""
-        fieldnames = ["year", "make", "model", "price", "mileage", "color", "url", "body_type"]
         with open(filepath, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+            writer = csv.writer(csvfile)
+            writer.writerow(FIELDNAMES)
             writer.writerows(rows)
     
+    def _save_category_csv(self, category, rows):
+        """Shuffle a category's rows in place and write its CSV file. Returns the file path."""
+        # Row order isn't used after scraping, so shuffle the list itself instead of a copy
+        random.shuffle(rows)
+        safe_name = category.lower().replace(" ", "_")
+        filepath = os.path.join(self.data_dir, f"car_listings_{safe_name}.csv")
+        self._write_rows_to_csv(rows, filepath=filepath)
+        return filepath
+    
     def _save_to_csv(self):
         """Save all scraped data to CSV files, with randomized order"""
         # Randomize order of all rows before saving
-        randomized_all_rows = self.all_rows.copy()
-        random.shuffle(randomized_all_rows)
+        random.shuffle(self.all_rows)
         main_csv_path = os.path.join(self.data_dir, "all_listings.csv")
-        self._write_rows_to_csv(randomized_all_rows, filepath=main_csv_path)
+        self._write_rows_to_csv(self.all_rows, filepath=main_csv_path)
         
-        fieldnames = ["year", "make", "model", "price", "mileage", "color", "url", "body_type"]
         for category, rows in self.category_rows.items():
-            # Randomize order of category rows before saving
-            randomized_rows = rows.copy()
-            random.shuffle(randomized_rows)
-            safe_name = category.lower().replace(" ", "_")
-            filename = f"car_listings_{safe_name}.csv"
-            filepath = os.path.join(self.data_dir, filename)
-            with open(filepath, "w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(randomized_rows)
+            self._save_category_csv(category, rows)
 
 
 def main():
@@ -530,6 +691,12 @@ def main():
         default=None,
         help="Directory to save CSV files (default: project data/)",
     )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="Categories to scrape at once, one browser each (default: 1; >1 cannot pause for manual CAPTCHA solving)",
+    )
     args = parser.parse_args()
 
     data_dir = args.data_dir
@@ -543,7 +710,7 @@ def main():
         os.makedirs(data_dir)
     print(f"Output directory: {data_dir}")
 
-    scraper = CarPagesScraper(data_dir=data_dir)
+    scraper = CarPagesScraper(data_dir=data_dir, workers=args.workers)
     scraper.scrapeWebsite()
 
 
@@ -0,0 +1,9 @@
+"""
+Shared pytest setup.
+Run from the project root: python -m pytest
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,73 @@
+"""
+Tests for CohereAPI parse caching: identical prompts share one Cohere chat call.
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from Cohere import CohereAPI
+
+REPLY = {"maximumPrice": 20000, "maximumMileage": 0, "minYear": 0, "maxYear": 2026, "color": "red", "carType": "SUV"}
+
+
+class _FakeHistogram:
+    def __init__(self):
+        self.values = []
+    
+    def observe(self, value):
+        self.values.append(value)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    cohere_api = CohereAPI(api_key="test-key", redis_url="", chat_latency=_FakeHistogram())
+    cohere_api.chat_calls = 0
+    
+    def fake_chat(**kwargs):
+        cohere_api.chat_calls += 1
+        time.sleep(0.05)  # long enough for concurrent callers to pile up behind the leader
+        return SimpleNamespace(text=orjson.dumps(REPLY).decode())
+    
+    monkeypatch.setattr(cohere_api.client, "chat", fake_chat)
+    return cohere_api
+
+
+def test_parse_reads_the_reply(api):
+    parsed = api.parse_car_query("cheap red SUV")
+    
+    assert (parsed.maximum_price, parsed.color, parsed.car_type) == (20000, "red", "SUV")
+
+
+def test_repeated_prompt_uses_the_cache(api):
+    api.parse_car_query("cheap red SUV")
+    api.parse_car_query("  Cheap RED   suv ")
+    
+    assert api.chat_calls == 1
+    # Only the real chat call is timed, not the cache hit
+    assert len(api.chat_latency.values) == 1
+
+
+def test_concurrent_identical_prompts_share_one_call(api):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(api.parse_car_query("cheap red SUV"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert api.chat_calls == 1
+    assert len(set(results)) == 1
+
+
+def test_late_caller_rechecks_the_cache_before_leading(api, monkeypatch):
+    first = api.parse_car_query("cheap red SUV")
+    
+    # A caller whose unlocked lookup ran just before the leader stored its result
+    # must find that result under the lock instead of starting a second call
+    monkeypatch.setattr(api, "_cache_get", lambda key: None)
+    
+    assert api.parse_car_query("cheap red SUV") == first
+    assert api.chat_calls == 1
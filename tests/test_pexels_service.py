@@ -0,0 +1,120 @@
+"""
+Tests for PexelsAPI image URL caching: real "no match" results are cached for
+a day, failed searches (rate limits, timeouts, errors) only briefly.
+"""
+import time
+
+import pytest
+import requests
+
+from Pexels import PexelsAPI
+
+PHOTO = {"alt": "red toyota corolla car", "url": "https://www.pexels.com/photo/1", "src": {"large": "https://img/1.jpg"}}
+
+
+class _FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+    
+    def json(self):
+        return self._payload
+
+
+class _FakeRedis:
+    """Records SETEX calls made through a pipeline; every key starts absent."""
+    
+    def __init__(self):
+        self.writes = {}
+    
+    def mget(self, keys):
+        return [None] * len(keys)
+    
+    def pipeline(self, transaction=False):
+        return self
+    
+    def setex(self, key, ttl_seconds, value):
+        self.writes[key] = (ttl_seconds, value)
+    
+    def execute(self):
+        pass
+
+
+@pytest.fixture
+def api():
+    pexels = PexelsAPI(api_key="test-key", redis_url="")
+    pexels.redis = _FakeRedis()
+    return pexels
+
+
+def _respond_with(api, monkeypatch, result):
+    def fake_get(*args, **kwargs):
+        if isinstance(result, Exception):
+            raise result
+        return result
+    monkeypatch.setattr(api.session, "get", fake_get)
+
+
+@pytest.mark.parametrize("result", [
+    _FakeResponse(429),
+    _FakeResponse(500),
+    requests.exceptions.Timeout(),
+    requests.exceptions.ConnectionError(),
+])
+def test_search_failure_is_none(api, monkeypatch, result):
+    _respond_with(api, monkeypatch, result)
+    assert api._search_car_photos("Toyota", "Corolla") is None
+
+
+def test_search_without_photos_is_empty(api, monkeypatch):
+    _respond_with(api, monkeypatch, _FakeResponse(200, {"photos": []}))
+    assert api._search_car_photos("Toyota", "Corolla") == []
+
+
+def test_found_photo_is_cached_long(api, monkeypatch):
+    _respond_with(api, monkeypatch, _FakeResponse(200, {"photos": [PHOTO]}))
+    
+    assert api.get_car_image_urls([("Toyota", "Corolla", 2020, "red")]) == ["https://img/1.jpg"]
+    assert api.redis.writes == {"img:toyota|corolla|2020|red": (api.REDIS_HIT_TTL_SECONDS, "https://img/1.jpg")}
+
+
+def test_no_match_is_negative_cached_for_a_day(api, monkeypatch):
+    _respond_with(api, monkeypatch, _FakeResponse(200, {"photos": []}))
+    
+    [image_url] = api.get_car_image_urls([("Toyota", "Corolla", 2020, "red")])
+    
+    assert image_url == api.get_fallback_image("Toyota", "Corolla", 2020)
+    assert api.redis.writes == {"img:toyota|corolla|2020|red": (api.REDIS_MISS_TTL_SECONDS, "")}
+
+
+def test_rate_limited_search_is_cached_briefly(api, monkeypatch):
+    _respond_with(api, monkeypatch, _FakeResponse(429))
+    
+    [image_url] = api.get_car_image_urls([("Toyota", "Corolla", 2020, "red")])
+    
+    assert image_url == api.get_fallback_image("Toyota", "Corolla", 2020)
+    assert api.redis.writes == {"img:toyota|corolla|2020|red": (api.SEARCH_ERROR_TTL_SECONDS, "")}
+    expires_at, cached = api._image_cache[("toyota", "corolla", 2020, "red")]
+    assert cached == ""
+    assert expires_at - time.monotonic() <= api.SEARCH_ERROR_TTL_SECONDS
+
+
+def test_failed_search_is_retried_after_error_ttl(api, monkeypatch):
+    _respond_with(api, monkeypatch, _FakeResponse(429))
+    api.get_car_image_urls([("Toyota", "Corolla", 2020, "red")])
+    
+    # Expire the in-process entry, as if SEARCH_ERROR_TTL_SECONDS had passed
+    key = ("toyota", "corolla", 2020, "red")
+    api._image_cache[key] = (time.monotonic() - 1, "")
+    _respond_with(api, monkeypatch, _FakeResponse(200, {"photos": [PHOTO]}))
+    
+    assert api.get_car_image_urls([("Toyota", "Corolla", 2020, "red")]) == ["https://img/1.jpg"]
+
+
+def test_photo_without_large_image_falls_back_briefly(api, monkeypatch):
+    _respond_with(api, monkeypatch, _FakeResponse(200, {"photos": [{"alt": "toyota corolla car", "src": {}}]}))
+    
+    [image_url] = api.get_car_image_urls([("Toyota", "Corolla", 2020, "red")])
+    
+    assert image_url == api.get_fallback_image("Toyota", "Corolla", 2020)
+    assert api.redis.writes == {"img:toyota|corolla|2020|red": (api.SEARCH_ERROR_TTL_SECONDS, "")}
@@ -0,0 +1,29 @@
+"""
+Tests for safe_int, which parses Cohere replies (CohereAPI) and API filter values (BackendService).
+"""
+import math
+
+import pytest
+
+from Cohere import safe_int
+
+
+@pytest.mark.parametrize("value, expected", [
+    (25000, 25000),
+    (25000.9, 25000),
+    ("25000", 25000),
+    ("20,000", 20000),
+    ("$15000.00", 15000),
+    ("15000.75", 15000),
+    ("-5", -5),
+    ("1e5", 100000),
+    ("2.5E3", 2500),
+    ("under 30,000 dollars", 30000),
+])
+def test_parses_numbers(value, expected):
+    assert safe_int(value) == expected
+
+
+@pytest.mark.parametrize("value", [None, "", "CALL", "null", True, math.inf, math.nan, "1e400"])
+def test_non_numbers_return_default(value):
+    assert safe_int(value, 7) == 7
@@ -0,0 +1,183 @@
+"""
+Tests for SupabaseService search caching/coalescing and bulk loading (CSV cleaning
+and the COPY staging path). The PostgreSQL test runs only when TEST_DATABASE_URL
+points at a throwaway database.
+"""
+import csv
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import pytest
+
+from Database_Model_Connection import SupabaseService
+
+COLUMNS = ["year", "make", "model", "price", "mileage", "color", "url", "body_type"]
+ROWS = [
+    [2020, "Toyota", "Corolla", 15000, 1000, "red", "https://example.com/1", "Sedan"],
+    [2019, "Honda", "Civic", 0, 0, "", "https://example.com/2", "Sedan"],
+]
+
+
+class _RecordingCursor:
+    """Cursor stand-in that records executed SQL and COPY payloads."""
+    
+    def __init__(self, statements):
+        self.statements = statements
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def execute(self, sql):
+        self.statements.append(sql)
+    
+    def copy_expert(self, sql, buffer):
+        self.statements.append(sql)
+        self.copied = buffer.read()
+
+
+class _RecordingConnection:
+    def __init__(self):
+        self.statements = []
+        self.committed = False
+    
+    def cursor(self):
+        return _RecordingCursor(self.statements)
+    
+    def commit(self):
+        self.committed = True
+
+
+@pytest.fixture
+def service():
+    return SupabaseService("https://example.supabase.co", "test-key")
+
+
+@pytest.fixture
+def counted_queries(service, monkeypatch):
+    """Replace the Supabase query with a slow fake that counts calls and caches like the real one."""
+    calls = []
+    
+    def fake_query(cache_key, *args):
+        calls.append(cache_key)
+        time.sleep(0.05)  # long enough for concurrent callers to pile up behind the leader
+        result = ([{"id": 1, "make": "Toyota"}], False, 1)
+        service._search_cache_put(cache_key, result)
+        return result
+    
+    monkeypatch.setattr(service, "_query_cars", fake_query)
+    return calls
+
+
+def test_repeated_search_uses_the_cache(service, counted_queries):
+    first = service.search_cars(make="Toyota", return_has_more=True)
+    second = service.search_cars(make="  toyota ", return_has_more=True)
+    
+    assert first == second == ([{"id": 1, "make": "Toyota"}], False, 1)
+    assert len(counted_queries) == 1
+
+
+def test_concurrent_identical_searches_share_one_query(service, counted_queries):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.search_cars(make="Toyota"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(counted_queries) == 1
+    assert results == [[{"id": 1, "make": "Toyota"}]] * 8
+    assert service._search_inflight == {}
+
+
+def test_mutating_returned_rows_does_not_change_the_cache(service, counted_queries):
+    first = service.search_cars(make="Toyota")
+    first[0]["make"] = "changed"
+    
+    assert service.search_cars(make="Toyota") == [{"id": 1, "make": "Toyota"}]
+    assert len(counted_queries) == 1
+
+
+def test_copy_rows_stages_only_the_loaded_columns(service, monkeypatch):
+    conn = _RecordingConnection()
+    
+    @contextmanager
+    def fake_connection(purpose):
+        yield conn
+    
+    monkeypatch.setattr(service, "_direct_connection", fake_connection)
+    
+    assert service.copy_rows("CarListings", COLUMNS, ROWS) == 2
+    create, copy, insert = conn.statements
+    column_list = ", ".join(f'"{column}"' for column in COLUMNS)
+    # LIKE would copy the NOT NULL id column, which COPY leaves empty
+    assert "LIKE" not in create
+    assert create == (
+        f'CREATE TEMP TABLE "CarListings_stage" ON COMMIT DROP AS '
+        f'SELECT {column_list} FROM "CarListings" WITH NO DATA'
+    )
+    assert copy.startswith(f'COPY "CarListings_stage" ({column_list}) FROM STDIN')
+    assert insert.startswith(f'INSERT INTO "CarListings" ({column_list}) SELECT {column_list}')
+    assert conn.committed
+
+
+def test_copy_rows_skips_empty_input(service, monkeypatch):
+    monkeypatch.setattr(service, "_direct_connection", None)
+    assert service.copy_rows("CarListings", COLUMNS, []) == 0
+
+
+def test_read_csv_rows_drops_generated_columns_and_cleans_call(service, tmp_path):
+    path = tmp_path / "listings.csv"
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["id", "created_at"] + COLUMNS)
+        writer.writerow([7, "2024-01-01", 2020, "Toyota", "Corolla", "CALL", "12000.0", "red", "u1", "Sedan"])
+        writer.writerow([8, "2024-01-01", 2018, "Mazda", "3", "9500", "", "", "u2"])
+    
+    columns, rows = service._read_csv_rows(path)
+    
+    assert columns == COLUMNS
+    assert rows == [
+        ["2020", "Toyota", "Corolla", 0, 12000, "red", "u1", "Sedan"],
+        ["2018", "Mazda", "3", 9500, 0, "", "u2", ""],
+    ]
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set")
+def test_copy_rows_loads_into_postgres(service, monkeypatch):
+    psycopg2 = pytest.importorskip("psycopg2")
+    dsn = os.environ["TEST_DATABASE_URL"]
+    monkeypatch.setenv("DATABASE_URL", dsn)
+    table_name = f"CarListings_test_{uuid.uuid4().hex[:8]}"
+    
+    # Same shape as CarListings: NOT NULL identity id plus generated timestamps
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE "{table_name}" ('
+                f'id integer GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, '
+                f'year integer, make text, model text, price integer, mileage integer, '
+                f'color text, url text, body_type text, '
+                f'created_at timestamptz DEFAULT now(), updated_at timestamptz DEFAULT now())'
+            )
+        conn.commit()
+        
+        assert service.copy_rows(table_name, COLUMNS, ROWS) == 2
+        
+        with conn.cursor() as cursor:
+            cursor.execute(f'SELECT id, make, price, color, created_at IS NOT NULL FROM "{table_name}" ORDER BY make')
+            rows = cursor.fetchall()
+        assert sorted(row[0] for row in rows) == [1, 2]
+        assert [row[1:] for row in rows] == [("Honda", 0, None, True), ("Toyota", 15000, "red", True)]
+    finally:
+        conn.rollback()
+        with conn.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+        conn.commit()
+        conn.close()